@@ -130,9 +130,13 @@ def save_data(data, output_path=None):
         # Ensure directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Write the data
-        with open(output_path, "w") as json_file:
+        # Write to a temporary file first so a partial manifest is never left behind
+        temp_path = output_path.with_name(f".{output_path.name}.partial")
+        with open(temp_path, "w") as json_file:
             json.dump(data, json_file, indent=4)
+            json_file.flush()
+            os.fsync(json_file.fileno())
+        os.replace(temp_path, output_path)
         
         logger.info(f"Data successfully saved to {output_path}")
         print(f"\nData successfully saved to {output_path}")
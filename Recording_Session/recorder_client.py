@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Session Recorder Client
+-----------------------
+Sends commands to a running recorder_daemon.py over its local Unix socket.
+Only the standard library is imported, so each command returns in milliseconds.
+
+Usage:
+    python recorder_client.py start --participant P01
+    python recorder_client.py mark [--notes TEXT]
+    python recorder_client.py annotate --notes TEXT [--id N]
+    python recorder_client.py end
+    python recorder_client.py status
+    python recorder_client.py shutdown
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+# Socket the daemon listens on; override with the SESSION_RECORDER_SOCKET variable
+SOCKET_PATH = os.environ.get(
+    "SESSION_RECORDER_SOCKET",
+    os.path.join(str(Path.home()), ".session_recorder_cache", "recorder.sock")
+)
+
+# Seconds to wait for the daemon to answer a command. Longer than the daemon's
+# own waits (up to twice its COMMAND_TIMEOUT), so its reply is always received
+CLIENT_TIMEOUT = 15.0
+
+
+def send_command(command, socket_path=SOCKET_PATH, timeout=CLIENT_TIMEOUT, **params):
+    """
+    Send one command to the daemon and return its reply as a dict.
+    Requests and replies are single lines of JSON.
+    """
+    request = dict(params, command=command)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("r", encoding="utf-8") as reply:
+            line = reply.readline()
+    if not line:
+        raise ConnectionError("Daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control a running session recorder daemon.")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Path of the daemon's Unix socket")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    start_parser = subparsers.add_parser("start", help="Start a new recording session")
+    start_parser.add_argument("--participant", help="Participant ID for the session")
+
+    mark_parser = subparsers.add_parser("mark", help="Record a timestamp now")
+    mark_parser.add_argument("--notes", default="", help="Notes for the timestamp")
+
+    annotate_parser = subparsers.add_parser("annotate", help="Set the notes of a recorded timestamp")
+    annotate_parser.add_argument("--notes", required=True, help="Notes for the timestamp")
+    annotate_parser.add_argument("--id", type=int, dest="timestamp_id",
+                                 help="Timestamp to annotate (default: the most recent)")
+
+    subparsers.add_parser("end", help="End the session and export its data")
+    subparsers.add_parser("status", help="Show the daemon's current state")
+    subparsers.add_parser("shutdown", help="End any session and stop the daemon")
+
+    args = parser.parse_args()
+    params = {key: value for key, value in vars(args).items()
+              if key not in ("command", "socket") and value is not None}
+
+    try:
+        reply = send_command(args.command, socket_path=args.socket, **params)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Session recorder daemon is not running (no socket at {args.socket})", file=sys.stderr)
+        sys.exit(2)
+    except (OSError, ValueError) as e:
+        print(f"Error communicating with the session recorder daemon: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    print(json.dumps(reply, indent=2))
+    if not reply.get("ok"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
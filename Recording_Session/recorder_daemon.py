@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Session Recorder Daemon
+-----------------------
+Runs a long-lived SessionRecorder that keeps its window warm between
+sessions, and accepts commands from recorder_client.py (or any program) over
+a local Unix socket.
+
+The keyboard hotkeys (Enter/'e' to record, 'r' to end) are off by default:
+the listener is global, so typing client commands in any window would
+trigger them. Pass --hotkeys to record from the keyboard as well.
+
+Commands are single JSON lines such as {"command": "mark", "notes": "..."}:
+    start     begin a session, optionally with "participant"
+    mark      record a timestamp with optional "notes"
+    annotate  set the "notes" of timestamp "timestamp_id" (default: latest)
+    end       end the session; the export runs in the background
+    status    report the session state and last export
+    shutdown  end any session and stop the daemon
+
+The socket server runs on its own thread and hands commands to the Tk thread
+through a queue, since tkinter may only be used from the thread running the
+main loop. A mark's time is taken when the command arrives, not when the Tk
+thread gets to it.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+
+from recorder_client import SOCKET_PATH, send_command
+from session_recorder import SessionRecorder, check_environment, log_file, logger
+
+# How often the Tk thread checks for socket commands
+COMMAND_POLL_MS = 10
+
+# Seconds the socket thread waits for the Tk thread to handle a command
+COMMAND_TIMEOUT = 5.0
+
+
+class QueuedCommand:
+    """
+    A socket command waiting for the Tk thread. Exactly one of claim() (by the
+    Tk thread, before running it) and abandon() (by the socket thread, when it
+    gives up waiting) succeeds, so a command reported as busy never runs later.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.replies = queue.Queue(maxsize=1)
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _set_state(self, state):
+        with self._lock:
+            if self._state is not None:
+                return False
+            self._state = state
+            return True
+
+    def claim(self):
+        return self._set_state("claimed")
+
+    def abandon(self):
+        return self._set_state("abandoned")
+
+
+class CommandServer(threading.Thread):
+    """Accepts socket connections and queues one command per connection."""
+
+    def __init__(self, socket_path, commands):
+        super().__init__(name="RecorderCommandServer", daemon=True)
+        self.socket_path = socket_path
+        self.commands = commands
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def bind(self):
+        """Bind the socket, replacing a stale socket file left by a previous daemon."""
+        if os.path.exists(self.socket_path):
+            try:
+                send_command("status", socket_path=self.socket_path, timeout=1.0)
+            except OSError:
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"A recorder daemon is already running on {self.socket_path}")
+
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        self.server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self.server.listen()
+        logger.info(f"Recorder daemon listening on {self.socket_path}")
+
+    def run(self):
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return  # Socket closed during shutdown
+            with connection:
+                try:
+                    self.handle(connection)
+                except Exception as e:
+                    logger.error(f"Error handling daemon command: {e}", exc_info=True)
+
+    def handle(self, connection):
+        received_at = datetime.datetime.now()
+        connection.settimeout(COMMAND_TIMEOUT)
+        with connection.makefile("r", encoding="utf-8") as reader:
+            line = reader.readline()
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            reply = {"ok": False, "error": f"Invalid request: {e}"}
+        else:
+            request["received_at"] = received_at
+            command = QueuedCommand(request)
+            self.commands.put(command)
+            try:
+                reply = command.replies.get(timeout=COMMAND_TIMEOUT)
+            except queue.Empty:
+                if command.abandon():
+                    reply = {"ok": False, "error": "Recorder is busy (a dialog may be open)"}
+                else:
+                    # The Tk thread is already running it, so report its result
+                    reply = self.wait_for_running(command)
+
+        connection.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+
+    def wait_for_running(self, command):
+        try:
+            return command.replies.get(timeout=COMMAND_TIMEOUT)
+        except queue.Empty:
+            return {"ok": False, "pending": True,
+                    "error": "The command is still running; check status before retrying"}
+
+    def close(self):
+        self.server.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class RecorderDaemon:
+    """Executes socket commands against a persistent SessionRecorder."""
+
+    def __init__(self, socket_path=SOCKET_PATH, hotkeys=False):
+        self.recorder = SessionRecorder(persistent=True)
+        self.hotkeys = hotkeys
+        self.commands = queue.Queue()
+        self.server = CommandServer(socket_path, self.commands)
+        self.handlers = {
+            "start": self.cmd_start,
+            "mark": self.cmd_mark,
+            "annotate": self.cmd_annotate,
+            "end": self.cmd_end,
+            "status": self.cmd_status,
+            "shutdown": self.cmd_shutdown
+        }
+
+    def run(self):
+        """Start the listener (if hotkeys are on) and socket server, then run the Tk main loop."""
+        recorder = self.recorder
+        if self.hotkeys and not recorder.start_listener():
+            return
+        logger.info(f"Keyboard hotkeys {'enabled' if self.hotkeys else 'disabled'}")
+        self.server.bind()
+        self.server.start()
+        recorder.status_label.config(text="Idle (daemon)", foreground="blue")
+        recorder.root.after(COMMAND_POLL_MS, self.poll_commands)
+        try:
+            recorder.root.mainloop()
+        finally:
+            self.server.close()
+            recorder.stop_listener()
+            logger.info("Recorder daemon stopped")
+
+    def poll_commands(self):
+        """Handle queued socket commands on the Tk thread."""
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            if not command.claim():
+                logger.debug(f"Skipping abandoned daemon command {command.request.get('command')}")
+                continue
+            request = command.request
+            handler = self.handlers.get(request.get("command"))
+            if handler is None:
+                reply = {"ok": False, "error": f"Unknown command: {request.get('command')}"}
+            else:
+                try:
+                    reply = handler(request)
+                except Exception as e:
+                    logger.error(f"Daemon command {request.get('command')} failed: {e}", exc_info=True)
+                    reply = {"ok": False, "error": str(e)}
+            command.replies.put(reply)
+        self.recorder.root.after(COMMAND_POLL_MS, self.poll_commands)
+
+    def cmd_start(self, request):
+        recorder = self.recorder
+        if recorder.recording:
+            return {"ok": False, "error": "A session is already in progress"}
+        participant_id = request.get("participant")
+        if participant_id:
+            # The manifest is usually generated just before the session
+            recorder.refresh_manifest_index()
+        recorder.begin_session(str(participant_id) if participant_id else None)
+        recorder.status_window.deiconify()
+        logger.info(f"Session started by daemon command (participant {participant_id})")
+        return {"ok": True, "participant_id": recorder.participant_id,
+                "manifest_path": recorder.manifest_path}
+
+    def cmd_mark(self, request):
+        recorder = self.recorder
+        if not recorder.recording:
+            return {"ok": False, "error": "No session is in progress"}
+        if not recorder.participant_id:
+            return {"ok": False, "error": "The session has no participant ID; start it with one"}
+        if recorder.notes_dialog_active:
+            # The keyboard timestamp already holds the next timestamp_id
+            return {"ok": False, "error": "A keyboard timestamp is waiting for notes; try again once it is saved"}
+        timestamp_data = recorder.build_timestamp(request["received_at"], str(request.get("notes", "")))
+        recorder.commit_timestamp(timestamp_data)
+        recorder.flash_status()
+        return {"ok": True, "timestamp_id": timestamp_data['timestamp_id'],
+                "iso_timestamp": timestamp_data['iso_timestamp']}
+
+    def cmd_annotate(self, request):
+        recorder = self.recorder
+        if not recorder.recording:
+            return {"ok": False, "error": "No session is in progress"}
+        if not recorder.timestamps:
+            return {"ok": False, "error": "No timestamps have been recorded"}
+        timestamp_id = request.get("timestamp_id", len(recorder.timestamps))
+        if not isinstance(timestamp_id, int) or not 1 <= timestamp_id <= len(recorder.timestamps):
+            return {"ok": False, "error": f"No timestamp with id {timestamp_id}"}
+        recorder.timestamps[timestamp_id - 1]['notes'] = str(request.get("notes", ""))
+        recorder.auto_backup_data()
+        logger.debug(f"Timestamp #{timestamp_id} annotated by daemon command")
+        return {"ok": True, "timestamp_id": timestamp_id}
+
+    def cmd_end(self, request):
+        recorder = self.recorder
+        if not recorder.recording:
+            return {"ok": False, "error": "No session is in progress"}
+        if recorder.notes_dialog_active:
+            return {"ok": False, "error": "A keyboard timestamp is waiting for notes; try again once it is saved"}
+        participant_id = recorder.participant_id
+        count = len(recorder.timestamps)
+        recorder.end_session()
+        return {"ok": True, "participant_id": participant_id, "timestamps": count,
+                "export_status": recorder.export_status}
+
+    def cmd_status(self, request):
+        recorder = self.recorder
+        return {
+            "ok": True,
+            "recording": recorder.recording,
+            "participant_id": recorder.participant_id,
+            "manifest_path": recorder.manifest_path,
+            "start_time": recorder.start_time.isoformat() if recorder.start_time else None,
+            "timestamps": len(recorder.timestamps),
+            "last_timestamp": recorder.timestamps[-1]['iso_timestamp'] if recorder.timestamps else None,
+            "interval_stats": recorder.interval_stats.as_dict(),
+            "export_status": recorder.export_status,
+            "last_export_path": recorder.last_export_path
+        }
+
+    def cmd_shutdown(self, request):
+        recorder = self.recorder
+        if recorder.recording:
+            recorder.end_session()
+        # The export worker is not a daemon thread, so it finishes before the process exits
+        recorder.root.after(100, recorder.root.quit)
+        logger.info("Recorder daemon shutting down")
+        return {"ok": True}
+
+
+def main():
+    """Start the recorder daemon."""
+    parser = argparse.ArgumentParser(description="Run the session recorder as a daemon controlled over a Unix socket.")
+    parser.add_argument("--hotkeys", action="store_true",
+                        help="Also record with Enter/'e' and end with 'r' (typed in any window)")
+    args = parser.parse_args()
+
+    print("Session Recorder Daemon")
+    print("=======================")
+    print(f"Log file: {log_file}")
+    print(f"Socket: {SOCKET_PATH}")
+    print(f"Keyboard hotkeys: {'on' if args.hotkeys else 'off'}")
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("\nUnix sockets are not available on this platform.")
+        sys.exit(1)
+
+    issues = check_environment()
+    if issues:
+        print("\nEnvironment Issues Detected:")
+        for issue in issues:
+            print(f"- {issue}")
+        sys.exit(1)
+
+    try:
+        RecorderDaemon(hotkeys=args.hotkeys).run()
+    except Exception as e:
+        logger.critical(f"Failed to run recorder daemon: {e}", exc_info=True)
+        print(f"\nCritical error: {e}")
+        print(f"See log file for details: {log_file}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ import threading
 import logging
 import json
 import tempfile
+import math
+import queue
+from collections import deque
 from pathlib import Path
 import tkinter as tk
 from tkinter import simpledialog, messagebox, ttk, font
@@ -28,14 +31,286 @@ logging.basicConfig(
 )
 logger = logging.getLogger("SessionRecorder")
 
+# Cache of participant manifests found in the Downloads folder
+cache_dir = os.path.join(str(Path.home()), ".session_recorder_cache")
+manifest_index_file = os.path.join(cache_dir, "manifest_index.json")
+
+# Number of recent manifests offered when a session starts
+RECENT_MANIFEST_LIMIT = 9
+
+# Number of most recent events used for the rolling event rate
+RATE_WINDOW_SIZE = 10
+
+# CSV columns written for every recorded timestamp
+EXPORT_FIELDNAMES = ['timestamp_id', 'date', 'hour', 'minute', 'second',
+                     'millisecond', 'iso_timestamp', 'notes']
+
+# Export tuning: attempts per directory, delay between attempts and how
+# often (in rows) the worker reports progress back to the UI
+EXPORT_ATTEMPTS = 3
+EXPORT_RETRY_DELAY = 0.5
+EXPORT_PROGRESS_INTERVAL = 500
+
+
+class IntervalStats:
+    """
+    Streaming statistics over the intervals between recorded events.
+    Every update is constant time, so the status window can refresh on
+    each timestamp without rescanning the whole session.
+    """
+
+    def __init__(self, window_size=RATE_WINDOW_SIZE):
+        self.window_size = window_size
+        self.reset()
+
+    def reset(self):
+        """Clear all accumulated state."""
+        self.count = 0
+        self.last_time = None
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared differences from the mean (Welford)
+        self.longest_gap = 0.0
+        self._window = deque(maxlen=self.window_size)
+
+    def add(self, event_time):
+        """Add an event time, given in seconds since the epoch."""
+        if self.last_time is not None:
+            interval = event_time - self.last_time
+            n = self.count  # Number of intervals after this one is added
+            delta = interval - self.mean
+            self.mean += delta / n
+            self._m2 += delta * (interval - self.mean)
+            if interval > self.longest_gap:
+                self.longest_gap = interval
+        self.count += 1
+        self.last_time = event_time
+        self._window.append(event_time)
+
+    @property
+    def interval_count(self):
+        return max(self.count - 1, 0)
+
+    @property
+    def variance(self):
+        """Sample variance of the inter-event interval in seconds squared."""
+        if self.interval_count < 2:
+            return 0.0
+        return self._m2 / (self.interval_count - 1)
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def window_rate(self):
+        """Events per minute over the last window_size events."""
+        if len(self._window) < 2:
+            return 0.0
+        span = self._window[-1] - self._window[0]
+        if span <= 0:
+            return 0.0
+        return (len(self._window) - 1) * 60.0 / span
+
+    def as_dict(self):
+        """Return a summary suitable for JSON export."""
+        return {
+            'event_count': self.count,
+            'interval_count': self.interval_count,
+            'mean_interval_s': round(self.mean, 3),
+            'interval_variance_s2': round(self.variance, 6),
+            'interval_std_dev_s': round(self.std_dev, 3),
+            'longest_gap_s': round(self.longest_gap, 3),
+            'rate_window_events': self.window_size,
+            'rate_per_minute': round(self.window_rate, 3)
+        }
+
+
+class ManifestIndex:
+    """
+    Index of participant manifests written by the Manifest Generator.
+
+    Manifests are found by scanning the search directories for
+    participant_*.json files. Parsed entries are cached on disk keyed by path,
+    size and modification time, so only new or changed manifests are read.
+    """
+
+    def __init__(self, search_dirs, cache_path=manifest_index_file):
+        self.search_dirs = [Path(d) for d in search_dirs]
+        self.cache_path = Path(cache_path)
+        self.entries = []
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _save_cache(self, cache):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_name(f".{self.cache_path.name}.partial")
+            with open(temp_path, 'w') as f:
+                json.dump(cache, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write manifest index cache: {e}")
+
+    @staticmethod
+    def _read_manifest(path, stat):
+        with open(path) as f:
+            data = json.load(f)
+        return {
+            'path': str(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'participant_id': str(data.get('participant_id', '')),
+            'participant_initials': data.get('participant_initials', ''),
+            'date': data.get('date', ''),
+            'generated_at': data.get('generated_at', '')
+        }
+
+    @staticmethod
+    def _is_current(entry, stat):
+        """Whether a cached entry is well-formed and matches the file on disk."""
+        if not isinstance(entry, dict):
+            return False
+        try:
+            return (entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+                    and isinstance(entry['participant_id'], str)
+                    and all(key in entry for key in ('path', 'participant_initials', 'date', 'generated_at')))
+        except KeyError:
+            return False
+
+    def refresh(self):
+        """Rescan the search directories, reusing cached entries for unchanged files."""
+        cache = self._load_cache()
+        updated = {}
+        for search_dir in self.search_dirs:
+            if not search_dir.is_dir():
+                continue
+            for path in search_dir.glob("participant_*.json"):
+                try:
+                    stat = path.stat()
+                    entry = cache.get(str(path))
+                    if not self._is_current(entry, stat):
+                        entry = self._read_manifest(path, stat)
+                except (OSError, ValueError, AttributeError) as e:
+                    logger.debug(f"Skipping unreadable manifest {path}: {e}")
+                    continue
+                if entry['participant_id']:
+                    updated[str(path)] = entry
+
+        if updated != cache:
+            self._save_cache(updated)
+        self.entries = sorted(updated.values(), key=lambda e: e['mtime_ns'], reverse=True)
+        logger.debug(f"Manifest index loaded with {len(self.entries)} manifests")
+        return self.entries
+
+    def recent(self, limit=RECENT_MANIFEST_LIMIT):
+        """Return the most recently modified manifests, one per participant."""
+        seen = set()
+        result = []
+        for entry in self.entries:
+            if entry['participant_id'] not in seen:
+                seen.add(entry['participant_id'])
+                result.append(entry)
+                if len(result) == limit:
+                    break
+        return result
+
+    def find(self, participant_id):
+        """Return the newest manifest for a participant ID, or None."""
+        for entry in self.entries:
+            if entry['participant_id'] == participant_id:
+                return entry
+        return None
+
+
+class ExportWorker(threading.Thread):
+    """
+    Writes a session CSV on a background thread so the Tk loop stays responsive.
+
+    Rows are written to a temporary file in the target directory which is then
+    renamed into place, so a half-written export never appears under the final
+    name. If a directory fails repeatedly the next one in output_dirs is tried.
+    Progress and the final result are posted to a queue as tuples:
+    ('progress', written, total), ('done', path) or ('failed', message).
+    """
+
+    def __init__(self, filename, metadata_lines, rows, output_dirs):
+        # Not a daemon thread: the interpreter waits for the export to finish
+        super().__init__(name="SessionExportWorker")
+        self.filename = filename
+        self.metadata_lines = list(metadata_lines)
+        self.rows = list(rows)
+        self.output_dirs = [Path(d) for d in output_dirs]
+        self.events = queue.Queue()
+
+    def run(self):
+        errors = []
+        for output_dir in self.output_dirs:
+            for attempt in range(1, EXPORT_ATTEMPTS + 1):
+                try:
+                    filepath = self._write(output_dir)
+                    logger.info(f"Successfully exported {len(self.rows)} timestamps to {filepath}")
+                    self.events.put(('done', str(filepath)))
+                    return
+                except Exception as e:
+                    logger.warning(f"Export attempt {attempt} to {output_dir} failed: {e}")
+                    errors.append(f"{output_dir}: {e}")
+                    if attempt < EXPORT_ATTEMPTS:
+                        time.sleep(EXPORT_RETRY_DELAY)
+
+        logger.error(f"Failed to export data to any directory: {errors}")
+        self.events.put(('failed', errors[-1] if errors else "No output directory available"))
+
+    def _write(self, output_dir):
+        """Write the CSV atomically into output_dir and return the final path."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = output_dir / self.filename
+        temp_path = output_dir / f".{self.filename}.partial"
+        logger.debug(f"Exporting data to {filepath}")
+
+        total = len(self.rows)
+        try:
+            with open(temp_path, 'w', newline='') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=EXPORT_FIELDNAMES)
+                writer.writeheader()
+
+                # Add metadata as a comment
+                for line in self.metadata_lines:
+                    csvfile.write(f"# {line}\n")
+
+                # Write timestamps in batches, reporting progress between them
+                for start in range(0, total, EXPORT_PROGRESS_INTERVAL):
+                    writer.writerows(self.rows[start:start + EXPORT_PROGRESS_INTERVAL])
+                    self.events.put(('progress', min(start + EXPORT_PROGRESS_INTERVAL, total), total))
+
+                csvfile.flush()
+                os.fsync(csvfile.fileno())
+            os.replace(temp_path, filepath)
+        except Exception:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        return filepath
+
+
 class SessionRecorder:
     """
     A class that records timestamps and notes during a session,
     triggered by keyboard events (Enter or 'e' key).
+    
+    With persistent=True the recorder keeps its window and keyboard listener
+    alive after a session ends, so further sessions can be started without
+    restarting the application (used by recorder_daemon.py).
     """
     
-    def __init__(self):
+    def __init__(self, persistent=False):
         # Initialize variables
+        self.persistent = persistent
         self.recording = False
         self.timestamps = []
         self.participant_id = None
@@ -48,14 +323,29 @@ class SessionRecorder:
         self.time_label = None
         self.count_label = None
         self.last_timestamp_label = None
+        self.mean_interval_label = None
+        self.std_dev_label = None
+        self.rate_label = None
+        self.longest_gap_label = None
+        self.interval_stats = IntervalStats()
         self.platform_info = self._get_platform_info()
         self.timer_thread = None
         self.timer_running = False
         self.notes_dialog_active = False  # Flag to track when notes dialog is active
+        self.export_worker = None
+        self.export_status = None
+        self.last_export_path = None
+        self.manifest_path = None
         
         # Get system info for logging
         logger.info(f"Session Recorder initialized on {self.platform_info}")
         
+        # Index existing participant manifests while the UI is being set up
+        self.manifest_index = ManifestIndex([Path.home() / "Downloads"])
+        self.manifest_thread = threading.Thread(target=self._load_manifest_index,
+                                                name="ManifestIndexLoader", daemon=True)
+        self.manifest_thread.start()
+        
         # Setup the tkinter windows
         self.setup_tkinter()
         
@@ -71,6 +361,18 @@ class SessionRecorder:
         }
         return info
         
+    def _load_manifest_index(self):
+        """Load the manifest index, logging rather than raising on failure."""
+        try:
+            self.manifest_index.refresh()
+        except Exception as e:
+            logger.error(f"Failed to load manifest index: {e}", exc_info=True)
+        
+    def refresh_manifest_index(self):
+        """Pick up manifests written since the index was loaded (only changed files are read)."""
+        self.manifest_thread.join()
+        self._load_manifest_index()
+        
     def setup_tkinter(self):
         """Set up the tkinter root window and status window."""
         try:
@@ -144,6 +446,15 @@ class SessionRecorder:
         self.last_timestamp_label = ttk.Label(last_ts_frame, text="None")
         self.last_timestamp_label.pack(side=tk.LEFT, padx=5)
         
+        # Live interval statistics
+        stats_frame = ttk.LabelFrame(frame, text="Intervals")
+        stats_frame.pack(fill=tk.X, pady=5)
+        
+        self.mean_interval_label = self._add_stat_row(stats_frame, "Mean:")
+        self.std_dev_label = self._add_stat_row(stats_frame, "Std Dev:")
+        self.rate_label = self._add_stat_row(stats_frame, f"Rate (last {RATE_WINDOW_SIZE}):")
+        self.longest_gap_label = self._add_stat_row(stats_frame, "Longest Gap:")
+        
         # Key commands reminder
         help_frame = ttk.LabelFrame(frame, text="Commands")
         help_frame.pack(fill=tk.X, pady=10)
@@ -156,6 +467,29 @@ class SessionRecorder:
         
         logger.debug("Status window created")
         
+    def _add_stat_row(self, parent, text):
+        """Add a label/value row to the interval statistics frame and return the value label."""
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X)
+        ttk.Label(row, text=text).pack(side=tk.LEFT)
+        value_label = ttk.Label(row, text="-")
+        value_label.pack(side=tk.LEFT, padx=5)
+        return value_label
+        
+    def update_interval_stats(self):
+        """Refresh the interval statistics shown in the status window."""
+        stats = self.interval_stats
+        if stats.interval_count == 0:
+            for label in (self.mean_interval_label, self.std_dev_label,
+                          self.rate_label, self.longest_gap_label):
+                label.config(text="-")
+            return
+            
+        self.mean_interval_label.config(text=f"{stats.mean:.2f} s")
+        self.std_dev_label.config(text=f"{stats.std_dev:.2f} s")
+        self.rate_label.config(text=f"{stats.window_rate:.1f} / min")
+        self.longest_gap_label.config(text=f"{stats.longest_gap:.2f} s")
+        
     def center_window(self, window):
         """Center a window on the screen."""
         window.update_idletasks()
@@ -189,6 +523,10 @@ class SessionRecorder:
         
     def on_key_press(self, key):
         """Handle key presses."""
+        # A persistent recorder keeps listening between sessions
+        if not self.recording:
+            return
+            
         try:
             # Check if Enter or 'e' key was pressed
             if (key == keyboard.Key.enter or 
@@ -202,7 +540,8 @@ class SessionRecorder:
                   not self.notes_dialog_active):
                 logger.info("Session end triggered by 'r' key")
                 self.end_session()
-                return False  # Stop listener
+                if not self.persistent:
+                    return False  # Stop listener
                 
         except Exception as e:
             logger.error(f"Error processing key press: {e}", exc_info=True)
@@ -218,26 +557,35 @@ class SessionRecorder:
         current_time = datetime.datetime.now()
         logger.debug(f"Recording timestamp at {current_time.isoformat()}")
         
-        # If this is the first timestamp, get the participant ID
+        # If no participant was selected before the session, ask for the ID now
         if not self.participant_id:
             logger.info("First timestamp - requesting participant ID")
             participant_id = simpledialog.askstring("Participant ID", 
                                                   "Enter participant ID number:",
                                                   parent=self.root)
             if participant_id:
-                self.participant_id = participant_id
-                self.start_date = current_time.strftime("%Y-%m-%d")
-                logger.info(f"Participant ID set to: {participant_id}")
-                
-                # Update status window title with participant ID
-                self.status_window.title(f"Session Recorder - Participant {participant_id}")
+                self.set_participant(participant_id)
             else:
                 logger.warning("No participant ID provided")
                 messagebox.showwarning("Warning", "Participant ID is required to start recording.")
                 return
         
-        # Format the timestamp components
-        timestamp_data = {
+        timestamp_data = self.build_timestamp(current_time)
+        
+        # Visual feedback - flash the status window
+        self.flash_status()
+        
+        # Ask for additional notes. The timestamp is pending until the dialog
+        # closes, so mark the dialog active now rather than when it opens
+        self.notes_dialog_active = True
+        self.root.after(100, lambda: self.get_notes(timestamp_data))
+    
+    def build_timestamp(self, current_time, notes=''):
+        """Format the components of the next timestamp."""
+        if not self.start_date:
+            self.start_date = current_time.strftime("%Y-%m-%d")
+            
+        return {
             'timestamp_id': len(self.timestamps) + 1,
             'date': current_time.strftime("%Y-%m-%d"),
             'hour': current_time.hour,
@@ -245,14 +593,104 @@ class SessionRecorder:
             'second': current_time.second,
             'millisecond': current_time.microsecond // 1000,  # Convert microseconds to milliseconds
             'iso_timestamp': current_time.isoformat(),
-            'notes': ''
+            'notes': notes
         }
         
-        # Visual feedback - flash the status window
-        self.flash_status()
+    def set_participant(self, participant_id):
+        """Set the participant ID and link the matching manifest, if one is indexed."""
+        self.participant_id = participant_id
+        entry = self.manifest_index.find(participant_id)
+        self.manifest_path = entry['path'] if entry else None
+        logger.info(f"Participant ID set to: {participant_id}")
+        if self.manifest_path:
+            logger.info(f"Linked participant manifest: {self.manifest_path}")
+            
+        # Update status window title with participant ID
+        self.status_window.title(f"Session Recorder - Participant {participant_id}")
         
-        # Ask for additional notes
-        self.root.after(100, lambda: self.get_notes(timestamp_data))
+    def select_participant_dialog(self):
+        """
+        Offer the most recent participant manifests before the session starts.
+        The highlighted manifest is chosen with Enter, or 1-9 picks one directly;
+        a new ID can be typed instead. Returns the chosen ID or None if skipped.
+        """
+        self.manifest_thread.join()
+        recent = self.manifest_index.recent()
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Select Participant")
+        dialog.transient(self.root)
+        dialog.resizable(False, False)
+        dialog.attributes("-topmost", True)
+        dialog.grab_set()
+        
+        frame = ttk.Frame(dialog, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        result = [None]
+        
+        listbox = None
+        if recent:
+            ttk.Label(frame, text="Recent participant manifests (Enter or 1-9 to select):").pack(anchor=tk.W, pady=(0, 5))
+            listbox = tk.Listbox(frame, height=len(recent), width=50, activestyle='dotbox')
+            for number, entry in enumerate(recent, start=1):
+                initials = f" ({entry['participant_initials']})" if entry['participant_initials'] else ""
+                listbox.insert(tk.END, f"{number}. Participant {entry['participant_id']}{initials}  {entry['date']}")
+            listbox.pack(fill=tk.X, pady=5)
+            listbox.selection_set(0)
+            listbox.activate(0)
+            
+        ttk.Label(frame, text="Or enter a participant ID:").pack(anchor=tk.W, pady=(5, 0))
+        entry_field = ttk.Entry(frame, width=50)
+        entry_field.pack(fill=tk.X, pady=5)
+        
+        def choose(index):
+            if 0 <= index < len(recent):
+                result[0] = recent[index]['participant_id']
+                dialog.destroy()
+                
+        def on_listbox_ok(event=None):
+            selection = listbox.curselection()
+            if selection:
+                choose(selection[0])
+                
+        def on_entry_ok(event=None):
+            value = entry_field.get().strip()
+            if value:
+                result[0] = value
+                dialog.destroy()
+                
+        def on_ok():
+            # A typed ID takes precedence over the highlighted manifest
+            if entry_field.get().strip() or listbox is None:
+                on_entry_ok()
+            else:
+                on_listbox_ok()
+                
+        def on_skip(event=None):
+            dialog.destroy()
+            
+        button_frame = ttk.Frame(frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(button_frame, text="OK", command=on_ok, width=10).pack(side=tk.RIGHT, padx=(5, 0))
+        ttk.Button(button_frame, text="Skip", command=on_skip, width=10).pack(side=tk.RIGHT)
+        
+        if listbox:
+            listbox.bind("<Return>", on_listbox_ok)
+            listbox.bind("<Double-Button-1>", on_listbox_ok)
+            for number in range(1, len(recent) + 1):
+                listbox.bind(str(number), lambda event, i=number - 1: choose(i))
+            listbox.focus_set()
+        else:
+            entry_field.focus_set()
+        entry_field.bind("<Return>", on_entry_ok)
+        dialog.bind("<Escape>", on_skip)
+        
+        self.center_window(dialog)
+        dialog.wait_window()
+        
+        return result[0]
     
     def flash_status(self):
         """Provide visual feedback by briefly changing the status label color."""
@@ -279,21 +717,29 @@ class SessionRecorder:
             timestamp_data['notes'] = notes
             logger.debug(f"Notes added: {notes}")
             
+        time_str = self.commit_timestamp(timestamp_data)
+        
+        # Show confirmation message
+        messagebox.showinfo("Timestamp Recorded", 
+                           f"Timestamp #{timestamp_data['timestamp_id']} recorded at {time_str}")
+    
+    def commit_timestamp(self, timestamp_data):
+        """Add a completed timestamp to the session and return its time of day."""
         self.timestamps.append(timestamp_data)
+        event_time = datetime.datetime.fromisoformat(timestamp_data['iso_timestamp'])
+        self.interval_stats.add(event_time.timestamp())
         
         # Update the status window
         self.count_label.config(text=str(len(self.timestamps)))
         time_str = timestamp_data['iso_timestamp'].split('T')[1]
         self.last_timestamp_label.config(text=time_str)
+        self.update_interval_stats()
         
         # Create auto-backup of data
         self.auto_backup_data()
         
-        # Show confirmation message
-        timestamp_id = timestamp_data['timestamp_id']
-        messagebox.showinfo("Timestamp Recorded", 
-                           f"Timestamp #{timestamp_id} recorded at {time_str}")
-        logger.info(f"Timestamp #{timestamp_id} recorded at {time_str}")
+        logger.info(f"Timestamp #{timestamp_data['timestamp_id']} recorded at {time_str}")
+        return time_str
     
     def custom_notes_dialog(self, title, prompt, parent=None):
         """
@@ -366,7 +812,9 @@ class SessionRecorder:
                 json.dump({
                     'participant_id': self.participant_id,
                     'start_date': self.start_date,
+                    'manifest_path': self.manifest_path,
                     'timestamps': self.timestamps,
+                    'interval_stats': self.interval_stats.as_dict(),
                     'backup_time': datetime.datetime.now().isoformat()
                 }, f, indent=2)
                 
@@ -381,11 +829,43 @@ class SessionRecorder:
             messagebox.showinfo("Info", "Session already in progress.")
             return
             
+        # Choose the participant up front so the first event is not held up by a prompt
+        participant_id = self.select_participant_dialog()
+        if not participant_id:
+            logger.info("Participant selection skipped - ID will be requested on first timestamp")
+        self.begin_session(participant_id)
+        
+        # Start the keyboard listener in a separate thread
+        if not self.start_listener():
+            self.recording = False
+            return
+        
+        messagebox.showinfo("Session Started", 
+                           "Recording session started!\n\n" +
+                           "Press Enter or 'e' to record a timestamp.\n" +
+                           "Press 'r' to end the session and save data.")
+                           
+        # Make status window visible
+        self.status_window.deiconify()
+                           
+        # Keep application running
+        self.root.mainloop()
+        
+    def begin_session(self, participant_id=None):
+        """Reset the session state and start recording."""
         logger.info("Starting recording session")
-        self.recording = True
         self.timestamps = []
+        self.interval_stats.reset()
         self.participant_id = None
+        self.manifest_path = None
         self.start_date = None
+        self.export_status = None
+        if participant_id:
+            self.set_participant(participant_id)
+        else:
+            self.status_window.title("Session Recorder Status")
+        
+        self.recording = True
         self.start_time = datetime.datetime.now()
         self.notes_dialog_active = False
         
@@ -393,34 +873,37 @@ class SessionRecorder:
         self.status_label.config(text="Recording", foreground="green")
         self.count_label.config(text="0")
         self.last_timestamp_label.config(text="None")
+        self.update_interval_stats()
         
         # Start the timer
         self.timer_running = True
         self.update_timer()
         
-        # Start the keyboard listener in a separate thread
+    def start_listener(self):
+        """Start the keyboard listener thread. Returns True on success."""
         try:
             # Create and start the listener
             self.listener = keyboard.Listener(on_press=self.on_key_press)
             self.listener.daemon = True  # Make it a daemon thread
             self.listener.start()
             logger.debug("Keyboard listener started")
+            return True
         except Exception as e:
             logger.error(f"Failed to start keyboard listener: {e}", exc_info=True)
             messagebox.showerror("Error", f"Failed to start keyboard listener: {e}")
-            self.recording = False
-            return
+            return False
         
-        messagebox.showinfo("Session Started", 
-                           "Recording session started!\n\n" +
-                           "Press Enter or 'e' to record a timestamp.\n" +
-                           "Press 'r' to end the session and save data.")
-                           
-        # Make status window visible
-        self.status_window.deiconify()
-                           
-        # Keep application running
-        self.root.mainloop()
+    def stop_listener(self):
+        """Stop the keyboard listener if it is running."""
+        if self.listener and self.listener.is_alive():
+            logger.debug("Stopping keyboard listener")
+            self.listener.stop()
+        self.listener = None
+        
+    def finish_session(self, delay=1500):
+        """Close the application after a session, unless the recorder is persistent."""
+        if not self.persistent:
+            self.root.after(delay, self.root.quit)
         
     def end_session(self):
         """End the recording session and export the data."""
@@ -433,75 +916,101 @@ class SessionRecorder:
         self.timer_running = False
         
         # Stop the keyboard listener
-        if self.listener and self.listener.is_alive():
-            logger.debug("Stopping keyboard listener")
-            self.listener.stop()
-            self.listener = None
+        if not self.persistent:
+            self.stop_listener()
         
         # Update status window
         self.status_label.config(text="Session Ended", foreground="blue")
         
         # Only export if we have timestamps and participant ID
         if self.timestamps and self.participant_id:
-            success = self.export_data()
-            if success:
-                messagebox.showinfo("Session Ended", 
-                                   f"Session for Participant {self.participant_id} ended.\n" +
-                                   f"Data saved to Downloads folder.")
-                logger.info(f"Session data saved for participant {self.participant_id}")
-            else:
-                # If export failed, keep the auto-backup
-                backup_path = os.path.join(tempfile.gettempdir(), f"session_backup_{self.participant_id}.json")
-                messagebox.showinfo("Session Ended", 
-                                   f"Session ended but data export failed.\n" +
-                                   f"Backup data available at: {backup_path}")
-                logger.warning(f"Session export failed, using backup at {backup_path}")
+            self.status_label.config(text="Saving...", foreground="orange")
+            self.export_data()
         else:
-            messagebox.showinfo("Session Ended", "Session ended. No data to save.")
             logger.info("Session ended with no data to save")
-        
-        # Close the tkinter window
-        self.root.quit()
+            self.status_label.config(text="Session Ended - no data to save", foreground="blue")
+            self.finish_session()
         
     def export_data(self):
-        """Export the recorded timestamps to a CSV file."""
-        try:
-            # Create the filename with participant ID and date
-            date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"session_recording_{self.participant_id}_{date_str}.csv"
-            
-            # Get the downloads folder path
-            downloads_path = str(Path.home() / "Downloads")
-            filepath = os.path.join(downloads_path, filename)
-            
-            logger.debug(f"Exporting data to {filepath}")
-            
-            # Define CSV headers
-            fieldnames = ['timestamp_id', 'date', 'hour', 'minute', 'second', 
-                         'millisecond', 'iso_timestamp', 'notes']
-            
-            # Write the data to CSV
-            with open(filepath, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
+        """Start exporting the recorded timestamps to a CSV file in the background."""
+        # Create the filename with participant ID and date
+        date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"session_recording_{self.participant_id}_{date_str}.csv"
+        
+        metadata_lines = [
+            f"Session Recording for Participant: {self.participant_id}",
+            f"Date: {self.start_date}",
+            f"Total Timestamps: {len(self.timestamps)}",
+            f"Manifest: {self.manifest_path or 'None'}",
+            f"System Info: {json.dumps(self.platform_info)}",
+            f"Interval Stats: {json.dumps(self.interval_stats.as_dict())}"
+        ]
+        
+        # Downloads first, then the temp directory that also holds the auto-backup
+        output_dirs = [Path.home() / "Downloads", Path(tempfile.gettempdir())]
+        
+        self.export_status = 'saving'
+        self.export_worker = ExportWorker(filename, metadata_lines, self.timestamps, output_dirs)
+        self.export_worker.start()
+        self.root.after(100, self.poll_export, self.export_worker, self.participant_id)
+        
+    def poll_export(self, worker, participant_id):
+        """
+        Apply progress and results posted by an export worker on the Tk thread.
+        A persistent recorder may start another session while an export is still
+        running; only the latest export updates the export status, and the status
+        window is left alone while a new session is recording.
+        """
+        latest = worker is self.export_worker
+        show = latest and not self.recording
+        while True:
+            try:
+                event = worker.events.get_nowait()
+            except queue.Empty:
+                break
                 
-                # Add metadata as a comment
-                csvfile.write(f"# Session Recording for Participant: {self.participant_id}\n")
-                csvfile.write(f"# Date: {self.start_date}\n")
-                csvfile.write(f"# Total Timestamps: {len(self.timestamps)}\n")
-                csvfile.write(f"# System Info: {json.dumps(self.platform_info)}\n")
+            if event[0] == 'progress':
+                _, written, total = event
+                if show:
+                    self.status_label.config(text=f"Saving... {written * 100 // total}%")
+            elif event[0] == 'done':
+                logger.info(f"Session data saved for participant {participant_id} to {event[1]}")
+                if latest:
+                    self.export_status = 'saved'
+                    self.last_export_path = event[1]
+                fallback = Path(event[1]).parent != worker.output_dirs[0]
+                if fallback:
+                    # Saved to a fallback directory, not where the operator will look for it
+                    logger.warning(f"Could not save to {worker.output_dirs[0]}; data saved to {event[1]}")
+                if show and fallback:
+                    self.status_label.config(text="Session Ended - saved to fallback folder", foreground="orange")
+                    self.last_timestamp_label.config(text=event[1])
+                    if not self.persistent:
+                        messagebox.showwarning("Saved to Fallback Folder",
+                                               f"Could not save to {worker.output_dirs[0]}.\n" +
+                                               f"Session data saved to: {event[1]}")
+                elif show:
+                    self.status_label.config(text="Session Ended - data saved", foreground="blue")
+                    self.last_timestamp_label.config(text=os.path.basename(event[1]))
+                if show:
+                    self.finish_session()
+                return
+            elif event[0] == 'failed':
+                # If export failed, keep the auto-backup
+                backup_path = os.path.join(tempfile.gettempdir(), f"session_backup_{participant_id}.json")
+                logger.warning(f"Session export failed, using backup at {backup_path}")
+                if latest:
+                    self.export_status = 'failed'
+                if show:
+                    self.status_label.config(text="Export failed", foreground="red")
+                    if not self.persistent:
+                        messagebox.showerror("Error",
+                                             f"Failed to export data: {event[1]}\n" +
+                                             f"Backup data available at: {backup_path}")
+                    self.finish_session(0)
+                return
                 
-                # Write all timestamps
-                for timestamp in self.timestamps:
-                    writer.writerow(timestamp)
-                    
-            logger.info(f"Successfully exported {len(self.timestamps)} timestamps to {filepath}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to export data: {e}", exc_info=True)
-            messagebox.showerror("Error", f"Failed to export data: {e}")
-            return False
+        self.root.after(100, self.poll_export, worker, participant_id)
     
     def on_close(self):
         """Handle window close event."""
@@ -509,16 +1018,13 @@ class SessionRecorder:
             if messagebox.askyesno("End Session", 
                                   "A recording session is in progress.\n" +
                                   "Do you want to end the session and save data?"):
+                # end_session closes the window once the export has finished
                 self.end_session()
-            else:
-                # User canceled, don't close
-                return
+            # Either the export closes the window or the user canceled
+            return
         else:
             # Stop the keyboard listener if it's still running
-            if self.listener and self.listener.is_alive():
-                logger.debug("Stopping keyboard listener on window close")
-                self.listener.stop()
-                self.listener = None
+            self.stop_listener()
         
         # No recording in progress, just close
         logger.info("Application closed by user")
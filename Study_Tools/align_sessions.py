@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Inter-Observer Session Alignment
+--------------------------------
+Compares two or more session recordings of the same session, made by
+different observers, and reports how well their events agree.
+
+Events from each pair of recordings are matched one-to-one within a time
+tolerance. The matching maximises the number of matched events and, among
+matchings of that size, minimises the total absolute offset. Because a
+matched pair can never span more than the tolerance, the merged event stream
+is first split wherever two consecutive events are further apart than the
+tolerance, and the matching is solved independently for each segment by
+dynamic programming. The table is restricted to a band: each event is only
+compared with the other observer's events within the tolerance, so alignment
+takes O((n + m) * k) time and memory, where k is the largest number of events
+one observer records within twice the tolerance. This holds even for dense
+sessions that form a single segment.
+
+Usage:
+    python align_sessions.py RECORDING.csv RECORDING.csv [...] [--tolerance SECONDS] [--shift SECONDS ...]
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import math
+import sys
+from pathlib import Path
+
+from session_data import read_session_recording
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stderr)
+    ]
+)
+logger = logging.getLogger("session-alignment")
+
+DEFAULT_TOLERANCE = 1.0  # seconds
+
+# Back-pointers of the matching table
+MOVE_UP, MOVE_LEFT, MOVE_DIAG = 0, 1, 2
+
+
+def split_segments(times_a, times_b, tolerance):
+    """
+    Split two sorted time lists into independent segments.
+    Yields (a_start, a_end, b_start, b_end) index ranges; no event in one
+    segment can be matched to an event in another.
+    """
+    i = j = 0
+    seg_a = seg_b = 0
+    last_time = None
+    while i < len(times_a) or j < len(times_b):
+        # Take the earlier of the next two events (sort-merge)
+        if j >= len(times_b) or (i < len(times_a) and times_a[i] <= times_b[j]):
+            t = times_a[i]
+            take_a = True
+        else:
+            t = times_b[j]
+            take_a = False
+
+        if last_time is not None and t - last_time > tolerance:
+            yield seg_a, i, seg_b, j
+            seg_a, seg_b = i, j
+
+        if take_a:
+            i += 1
+        else:
+            j += 1
+        last_time = t
+
+    if seg_a < len(times_a) or seg_b < len(times_b):
+        yield seg_a, len(times_a), seg_b, len(times_b)
+
+
+def match_segment(times_a, a_start, a_end, times_b, b_start, b_end, tolerance):
+    """
+    Optimal non-crossing matching of one segment, computed over the band of
+    event pairs within tolerance.
+    Returns a list of (index_a, index_b) pairs using indices into the full lists.
+    """
+    n = a_end - a_start
+    m = b_end - b_start
+    if n == 0 or m == 0:
+        return []
+
+    # Fast path for the common case of one event from each observer
+    if n == 1 and m == 1:
+        if abs(times_a[a_start] - times_b[b_start]) <= tolerance:
+            return [(a_start, b_start)]
+        return []
+
+    # best[i][j] = (matches, -total_offset) for the first i and j events.
+    # a[i] can only match the b events within tolerance, a window that only
+    # moves forward as i grows. Each row stores prefix lengths lo..hi of that
+    # window: for j < lo, best[i][j] equals best[i - 1][j], and for j > hi it
+    # equals best[i][hi], since those b events cannot match a[i] or anything
+    # before it. Only the previous row's values and every row's moves are kept.
+    rows = [(0, 0, [MOVE_UP])]
+    prev_lo, prev_hi, prev_values = 0, 0, [(0, 0.0)]
+    lo = hi = 0
+    for i in range(1, n + 1):
+        ta = times_a[a_start + i - 1]
+        # Compare differences, as the matching does, so rounding cannot shift the window
+        while lo < m and ta - times_b[b_start + lo] > tolerance:
+            lo += 1
+        while hi < m and times_b[b_start + hi] - ta <= tolerance:
+            hi += 1
+
+        values = [prev_values[min(lo, prev_hi) - prev_lo]]
+        moves = [MOVE_UP]
+        for j in range(lo + 1, hi + 1):
+            up = prev_values[min(j, prev_hi) - prev_lo]
+            left = values[-1]
+            if up >= left:
+                value, move = up, MOVE_UP
+            else:
+                value, move = left, MOVE_LEFT
+            diag = prev_values[min(j - 1, prev_hi) - prev_lo]
+            candidate = (diag[0] + 1, diag[1] - abs(ta - times_b[b_start + j - 1]))
+            if candidate > value:
+                value, move = candidate, MOVE_DIAG
+            values.append(value)
+            moves.append(move)
+
+        rows.append((lo, hi, moves))
+        prev_lo, prev_hi, prev_values = lo, hi, values
+
+    # Backtrack to recover the pairs
+    pairs = []
+    i, j = n, m
+    while i > 0 and j > 0:
+        lo, hi, moves = rows[i]
+        if j > hi:
+            j = hi
+            continue
+        move = moves[j - lo]
+        if move == MOVE_UP:
+            i -= 1
+        elif move == MOVE_LEFT:
+            j -= 1
+        else:
+            pairs.append((a_start + i - 1, b_start + j - 1))
+            i -= 1
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+
+def align_events(times_a, times_b, tolerance=DEFAULT_TOLERANCE):
+    """
+    Match two sorted lists of event times one-to-one within tolerance seconds.
+    Returns a list of (index_a, index_b) pairs in time order.
+    """
+    pairs = []
+    for a_start, a_end, b_start, b_end in split_segments(times_a, times_b, tolerance):
+        pairs.extend(match_segment(times_a, a_start, a_end, times_b, b_start, b_end, tolerance))
+    return pairs
+
+
+def agreement_report(recording_a, recording_b, tolerance=DEFAULT_TOLERANCE, shift_b=0.0):
+    """
+    Align two session recordings and summarise their agreement.
+    shift_b is added to every time in recording_b to correct a known clock offset.
+    """
+    events_a = sorted(recording_a['events'], key=lambda e: e['time'])
+    events_b = sorted(recording_b['events'], key=lambda e: e['time'])
+    times_a = [e['time'] for e in events_a]
+    times_b = [e['time'] + shift_b for e in events_b]
+
+    pairs = align_events(times_a, times_b, tolerance)
+    offsets = [times_b[j] - times_a[i] for i, j in pairs]
+    matched = len(pairs)
+    total = len(events_a) + len(events_b)
+
+    mean_offset = sum(offsets) / matched if matched else 0.0
+    if matched > 1:
+        sd_offset = math.sqrt(sum((o - mean_offset) ** 2 for o in offsets) / (matched - 1))
+    else:
+        sd_offset = 0.0
+
+    matched_a = {i for i, _ in pairs}
+    matched_b = {j for _, j in pairs}
+
+    return {
+        'recording_a': recording_a['path'],
+        'recording_b': recording_b['path'],
+        'tolerance_s': tolerance,
+        'shift_b_s': shift_b,
+        'events_a': len(events_a),
+        'events_b': len(events_b),
+        'matched': matched,
+        # Dice coefficient: share of all events that have a partner
+        'agreement': round(2 * matched / total, 4) if total else 1.0,
+        'mean_offset_s': round(mean_offset, 4),
+        'mean_abs_offset_s': round(sum(abs(o) for o in offsets) / matched, 4) if matched else 0.0,
+        'offset_sd_s': round(sd_offset, 4),
+        'unmatched_a': [events_a[i]['timestamp_id'] for i in range(len(events_a)) if i not in matched_a],
+        'unmatched_b': [events_b[j]['timestamp_id'] for j in range(len(events_b)) if j not in matched_b],
+        'pairs': [(events_a[i]['timestamp_id'], events_b[j]['timestamp_id'], round(times_b[j] - times_a[i], 4))
+                  for i, j in pairs]
+    }
+
+
+def print_report(report, show_pairs=False):
+    """Print a human-readable agreement summary."""
+    print(f"\n{Path(report['recording_a']).name}  vs  {Path(report['recording_b']).name}")
+    print("-" * 50)
+    print(f"Events:           {report['events_a']} / {report['events_b']}")
+    print(f"Matched:          {report['matched']} (tolerance {report['tolerance_s']} s)")
+    print(f"Agreement:        {report['agreement']:.1%}")
+    print(f"Mean offset:      {report['mean_offset_s']:+.3f} s (B - A)")
+    print(f"Mean |offset|:    {report['mean_abs_offset_s']:.3f} s")
+    print(f"Offset std dev:   {report['offset_sd_s']:.3f} s")
+    print(f"Unmatched in A:   {report['unmatched_a'] or 'none'}")
+    print(f"Unmatched in B:   {report['unmatched_b'] or 'none'}")
+    if show_pairs:
+        print("Matched pairs (A id, B id, offset s):")
+        for a_id, b_id, offset in report['pairs']:
+            print(f"  {a_id:>6} {b_id:>6} {offset:+.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure agreement between observers' session recordings.")
+    parser.add_argument("recordings", nargs="+", type=Path, help="Two or more session_recording_*.csv files")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Maximum offset in seconds for two events to match (default {DEFAULT_TOLERANCE})")
+    parser.add_argument("--shift", type=float, nargs="*", default=[],
+                        help="Seconds to add to each recording's times, in the order given, to correct clock offsets")
+    parser.add_argument("--pairs", action="store_true", help="List every matched pair")
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    args = parser.parse_args()
+
+    if len(args.recordings) < 2:
+        parser.error("at least two recordings are required")
+    if args.shift and len(args.shift) != len(args.recordings):
+        parser.error("--shift needs one value per recording")
+    if args.tolerance <= 0:
+        parser.error("--tolerance must be positive")
+
+    shifts = args.shift or [0.0] * len(args.recordings)
+
+    try:
+        recordings = [read_session_recording(path) for path in args.recordings]
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Could not read recording: {e}", exc_info=True)
+        print(f"\nError reading recording: {e}")
+        sys.exit(1)
+
+    participant_ids = {r['participant_id'] for r in recordings}
+    if len(participant_ids) > 1:
+        logger.warning(f"Recordings are for different participants: {sorted(map(str, participant_ids))}")
+
+    reports = []
+    for (rec_a, shift_a), (rec_b, shift_b) in itertools.combinations(zip(recordings, shifts), 2):
+        # Shift both recordings by expressing B's shift relative to A
+        report = agreement_report(rec_a, rec_b, args.tolerance, shift_b - shift_a)
+        logger.info(f"Aligned {Path(rec_a['path']).name} and {Path(rec_b['path']).name}: "
+                    f"{report['matched']} matched, agreement {report['agreement']:.3f}")
+        reports.append(report)
+
+    if args.json:
+        if not args.pairs:
+            for report in reports:
+                del report['pairs']
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print_report(report, args.pairs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Synthetic Study Dataset Generator
+---------------------------------
+Generates participant manifests (per information/DATA_SCHEMA.md) and matching
+session_recording_*.csv files for scale-testing the study tools.
+
+Participants are generated in parallel worker processes. Each participant uses
+its own random generator derived from --seed and its index, so the output is
+identical regardless of the number of workers.
+
+Usage:
+    python generate_dataset.py OUTPUT_FOLDER [--participants N] [--sessions N]
+        [--event-rate PER_MINUTE] [--duration MINUTES] [--note-probability P]
+        [--note-length WORDS] [--seed N] [--workers N]
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from session_data import event_from_time, write_session_recording
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger("dataset-generator")
+
+# Matches the version written by Manifest-Generator/manifest.py
+GENERATOR_VERSION = "1.1.0"
+
+SUBJECT_TOPICS = ["Astronomy", "Geography", "Literature", "Mathematics", "Psychology"]
+GENDERS = ["female", "male", "non-binary", "prefer not to say"]
+SCREEN_RESOLUTIONS = ["1920x1080", "2560x1440", "1680x1050", "3840x2160"]
+SAMPLING_RATES = ["60 Hz", "120 Hz", "250 Hz", "500 Hz"]
+AUDIO_OPTIONS = ["one", "two", "none"]
+NOTE_WORDS = ("participant looked away paused answered question correctly incorrectly "
+              "hesitated asked for clarification smiled frowned fixation on stimulus "
+              "left right screen profile topic change interrupted resumed laughed").split()
+
+
+def make_manifest(rng, participant_id, session_start, note_length):
+    """Build a manifest dict with every field from DATA_SCHEMA.md."""
+    return {
+        "date": session_start.strftime("%Y-%m-%d"),
+        "current_time": session_start.strftime("%H:%M"),
+        "participant_id": participant_id,
+        "participant_initials": "".join(rng.choice("ABCDEFGHIJKLMNOPRSTW") for _ in range(2)),
+        "assigned_subject_knowledge": rng.choice(SUBJECT_TOPICS),
+        "methods_of_analysis": rng.randint(1, 4),
+        "recruitment_form_completed": rng.random() < 0.9,
+        "participant_gender": rng.choice(GENDERS),
+        "subject_knowledge_topics": rng.sample(range(1, 6), 2),
+        "behavioral_profiles": rng.sample(range(1, 6), 2),
+        "screen_resolution": rng.choice(SCREEN_RESOLUTIONS),
+        "screen_distance": f"{rng.randint(50, 90)} cm",
+        "sampling_rate": rng.choice(SAMPLING_RATES),
+        "additional_notes": "Synthetic participant. " + make_note(rng, note_length),
+        "audio_recording": rng.choice(AUDIO_OPTIONS),
+        "generated_at": session_start.isoformat(),
+        "generator_version": GENERATOR_VERSION
+    }
+
+
+def make_note(rng, mean_words):
+    """Return a random note of roughly mean_words words."""
+    count = max(1, round(rng.expovariate(1 / mean_words))) if mean_words > 0 else 1
+    return " ".join(rng.choice(NOTE_WORDS) for _ in range(count))
+
+
+def make_events(rng, session_start, event_rate, duration, note_probability, note_length):
+    """Generate events as a Poisson process of event_rate per minute over duration minutes."""
+    events = []
+    elapsed = 0.0
+    mean_interval = 60.0 / event_rate
+    limit = duration * 60.0
+    while True:
+        elapsed += rng.expovariate(1 / mean_interval)
+        if elapsed > limit:
+            break
+        notes = make_note(rng, note_length) if rng.random() < note_probability else ''
+        event_time = session_start + datetime.timedelta(seconds=elapsed)
+        events.append(event_from_time(len(events) + 1, event_time, notes))
+    return events
+
+
+def generate_participant(index, options):
+    """Write one participant's manifest and sessions. Returns (sessions, events) written."""
+    rng = random.Random(f"{options['seed']}-{index}")
+    output = Path(options['output'])
+    participant_id = f"{options['id_prefix']}{index:06d}"
+
+    study_start = datetime.datetime.fromisoformat(options['start_date'])
+    first_session = study_start + datetime.timedelta(days=rng.randint(0, options['span_days']),
+                                                     hours=rng.randint(8, 17),
+                                                     minutes=rng.randint(0, 59))
+    manifest = make_manifest(rng, participant_id, first_session, options['note_length'])
+    manifest_name = f"participant_{participant_id}.json"
+    with open(output / manifest_name, "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    total_events = 0
+    for session in range(options['sessions']):
+        session_start = first_session + datetime.timedelta(days=session, seconds=rng.randint(0, 3600))
+        events = make_events(rng, session_start, options['event_rate'], options['duration'],
+                             options['note_probability'], options['note_length'])
+        filename = f"session_recording_{participant_id}_{session_start.strftime('%Y%m%d_%H%M%S')}.csv"
+        write_session_recording(output / filename, participant_id, events, {
+            "Manifest": manifest_name,
+            "Synthetic": json.dumps({"seed": options['seed'], "participant_index": index, "session": session})
+        })
+        total_events += len(events)
+    return options['sessions'], total_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic study dataset for scale testing.")
+    parser.add_argument("output", type=Path, help="Folder to write manifests and session recordings to")
+    parser.add_argument("--participants", type=int, default=100, help="Number of participants (default 100)")
+    parser.add_argument("--sessions", type=int, default=1, help="Sessions per participant (default 1)")
+    parser.add_argument("--event-rate", type=float, default=6.0, help="Mean events per minute (default 6)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Session length in minutes (default 60)")
+    parser.add_argument("--note-probability", type=float, default=0.3,
+                        help="Probability that an event has notes (default 0.3)")
+    parser.add_argument("--note-length", type=float, default=5.0, help="Mean words per note (default 5)")
+    parser.add_argument("--start-date", default="2025-01-06", help="First possible session date (default 2025-01-06)")
+    parser.add_argument("--span-days", type=int, default=90, help="Days over which sessions are spread (default 90)")
+    parser.add_argument("--id-prefix", default="SYN", help="Prefix for participant IDs (default SYN)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default 0)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.participants < 1 or args.sessions < 1 or args.workers < 1:
+        parser.error("--participants, --sessions and --workers must be at least 1")
+    if args.event_rate <= 0 or args.duration <= 0:
+        parser.error("--event-rate and --duration must be positive")
+    if args.span_days < 0:
+        parser.error("--span-days must be 0 or more")
+    if not 0 <= args.note_probability <= 1:
+        parser.error("--note-probability must be between 0 and 1")
+    try:
+        datetime.datetime.fromisoformat(args.start_date)
+    except ValueError:
+        parser.error("--start-date must be an ISO date (YYYY-MM-DD)")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    options = {
+        'output': str(args.output),
+        'sessions': args.sessions,
+        'event_rate': args.event_rate,
+        'duration': args.duration,
+        'note_probability': args.note_probability,
+        'note_length': args.note_length,
+        'start_date': args.start_date,
+        'span_days': args.span_days,
+        'id_prefix': args.id_prefix,
+        'seed': args.seed
+    }
+
+    logger.info(f"Generating {args.participants} participants x {args.sessions} sessions "
+                f"into {args.output} with {args.workers} workers")
+    started = time.perf_counter()
+    total_sessions = total_events = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            chunksize = max(1, args.participants // (args.workers * 4))
+            results = executor.map(generate_participant, range(1, args.participants + 1),
+                                   [options] * args.participants, chunksize=chunksize)
+            for sessions, events in results:
+                total_sessions += sessions
+                total_events += events
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+        print("\nInterrupted. Exiting.")
+        sys.exit(130)
+    except OSError as e:
+        logger.error(f"Failed to write dataset: {e}", exc_info=True)
+        print(f"\nError writing dataset: {e}")
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - started
+    rate = total_events / elapsed * 60 if elapsed else 0
+    print(f"\nWrote {args.participants} manifests, {total_sessions} session recordings and "
+          f"{total_events:,} events in {elapsed:.1f} s ({rate:,.0f} events/minute)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Web Stopwatch Importer
+----------------------
+Imports `stopwatch-export.json` / `stopwatch-export.csv` files downloaded from
+the web stopwatch (index.html) into a session store folder, as session
+recordings in the same CSV format as the Recording Session module.
+
+Exports are parsed as a stream, one stopwatch session at a time, so large
+exports are never loaded into memory whole. Every start, stop, mark and lap
+entry becomes one event. Each imported session is identified by its
+stopwatch session ID and first entry time, and a content hash is kept in
+the store's index file: re-importing an unchanged session is skipped, and a
+session that has gained entries since the last import replaces its earlier
+file. This lets months of browser exports be folded in incrementally.
+
+Usage:
+    python import_web_exports.py EXPORT [EXPORT ...] [--store FOLDER] [--participant ID]
+"""
+
+import argparse
+import csv
+import datetime
+import hashlib
+import itertools
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+
+from session_data import event_from_time, write_atomic, write_session_recording
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger("web-importer")
+
+IMPORT_INDEX_NAME = "web_imports.json"
+READ_CHUNK_SIZE = 64 * 1024
+
+# Columns of the web stopwatch's CSV export
+WEB_CSV_FIELDNAMES = ['session_id', 'session_name', 'entry_type', 'timestamp',
+                      'elapsed_time', 'lap_number', 'lap_time']
+
+
+def iter_json_array(f, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time.
+    Only the element currently being decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+
+    def fill(min_size):
+        nonlocal buffer, eof
+        chunk = f.read(max(chunk_size, min_size))
+        if not chunk:
+            eof = True
+        buffer += chunk
+
+    def skip_whitespace():
+        nonlocal buffer
+        while True:
+            stripped = buffer.lstrip()
+            if stripped or eof:
+                buffer = stripped
+                return
+            buffer = ""
+            fill(0)
+
+    skip_whitespace()
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array of stopwatch sessions")
+    buffer = buffer[1:]
+
+    while True:
+        skip_whitespace()
+        if buffer.startswith("]"):
+            return
+        if buffer.startswith(","):
+            buffer = buffer[1:]
+            skip_whitespace()
+        if not buffer:
+            raise ValueError("Unexpected end of JSON export")
+
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer)
+                break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Read at least as much again, so a large element costs linear time
+                fill(len(buffer))
+        buffer = buffer[end:]
+        yield element
+
+
+def iter_json_sessions(f):
+    """Yield (session_id, session_name, entries) from a JSON export."""
+    for session in iter_json_array(f):
+        if not isinstance(session, dict):
+            raise ValueError(f"Expected a stopwatch session object, got {type(session).__name__}")
+        entries = []
+        for entry in session.get('entries', []):
+            timestamp = entry.get('timestamp') or {}
+            if isinstance(timestamp, dict):
+                timestamp = timestamp.get('formatted') or timestamp.get('raw')
+            entries.append({
+                'type': entry.get('type', ''),
+                'timestamp': timestamp,
+                'elapsed': entry.get('elapsedAtMarkFormatted', ''),
+                'lap_number': entry.get('lapNumber', ''),
+                'lap_time': entry.get('lapTimeFormatted', '')
+            })
+        yield session.get('id'), session.get('name', ''), entries
+
+
+def iter_csv_sessions(f):
+    """Yield (session_id, session_name, entries) from a CSV export."""
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header != WEB_CSV_FIELDNAMES:
+        raise ValueError(f"Unexpected CSV header: {header}")
+
+    def parse(row):
+        # Session names are not quoted by the exporter, so commas in a name split it
+        if len(row) > len(WEB_CSV_FIELDNAMES):
+            extra = len(row) - len(WEB_CSV_FIELDNAMES)
+            row = [row[0], ','.join(row[1:2 + extra])] + row[2 + extra:]
+        return dict(zip(WEB_CSV_FIELDNAMES, row))
+
+    rows = (parse(row) for row in reader if row)
+    for (session_id, session_name), group in itertools.groupby(
+            rows, key=lambda r: (r['session_id'], r['session_name'])):
+        entries = [{
+            'type': r['entry_type'],
+            'timestamp': r['timestamp'],
+            'elapsed': r['elapsed_time'],
+            'lap_number': r['lap_number'],
+            'lap_time': r['lap_time']
+        } for r in group]
+        yield session_id, session_name, entries
+
+
+def parse_web_timestamp(value):
+    """Convert a browser ISO timestamp (UTC, 'Z' suffix) to naive local time like the recorder uses."""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def entry_notes(session_name, entry):
+    """Describe a stopwatch entry in the recorder's free-text notes column."""
+    notes = f"web stopwatch {session_name}: {entry['type']}"
+    if entry['type'] == 'lap' and entry['lap_number'] != '':
+        notes += f" {entry['lap_number']} (lap {entry['lap_time']})"
+    if entry['elapsed']:
+        notes += f" at {entry['elapsed']}"
+    return notes
+
+
+def normalize_session(session_name, entries):
+    """Convert stopwatch entries into recorder events, ordered by time."""
+    timed = []
+    for entry in entries:
+        if not entry['timestamp']:
+            continue
+        timed.append((parse_web_timestamp(str(entry['timestamp'])), entry))
+    timed.sort(key=lambda item: item[0])
+    return [event_from_time(number, event_time, entry_notes(session_name, entry))
+            for number, (event_time, entry) in enumerate(timed, start=1)]
+
+
+def content_hash(session_name, events):
+    """Return a BLAKE2b digest identifying a normalized session's contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(session_name.encode('utf-8'))
+    for event in events:
+        digest.update(f"\n{event['iso_timestamp']}\t{event['notes']}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def safe_name(text):
+    """Make text safe for use in a file name."""
+    return re.sub(r'[^A-Za-z0-9.-]+', '-', str(text)).strip('-') or 'unnamed'
+
+
+class SessionStore:
+    """
+    A folder of session recordings plus an index of imported web sessions.
+    The index maps a session key to its content hash and output file name.
+    Every session gets its own file; a file name is never shared by two keys.
+    """
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        self.index_path = self.folder / IMPORT_INDEX_NAME
+        self.index = {}
+        if self.index_path.exists():
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+        # File name -> keys of the sessions stored in it. Earlier versions could
+        # put two sessions in one file; those sessions are re-imported into files
+        # of their own, and the shared file is removed once none refers to it.
+        self.file_keys = {}
+        for key, entry in self.index.items():
+            self.file_keys.setdefault(entry['file'], set()).add(key)
+        self.reimport_keys = {key for keys in self.file_keys.values() if len(keys) > 1 for key in keys}
+
+    def unique_filename(self, key, stem):
+        """Return stem.csv, or stem-N.csv if that file belongs to something else."""
+        candidate = f"{stem}.csv"
+        number = 2
+        while True:
+            keys = self.file_keys.get(candidate)
+            if keys == {key} or (keys is None and not (self.folder / candidate).exists()):
+                return candidate
+            candidate = f"{stem}-{number}.csv"
+            number += 1
+
+    def save_index(self):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with write_atomic(self.index_path) as f:
+            json.dump(self.index, f, indent=4, sort_keys=True)
+
+    def import_session(self, source, session_id, session_name, entries, participant_id=None):
+        """
+        Add one stopwatch session to the store.
+        Returns 'imported', 'updated', 'unchanged' or 'empty'.
+        """
+        events = normalize_session(session_name, entries)
+        if not events:
+            return 'empty'
+
+        key = f"{session_id}@{events[0]['iso_timestamp']}"
+        digest = content_hash(session_name, events)
+        existing = self.index.get(key)
+        if existing and existing['hash'] == digest and key not in self.reimport_keys:
+            return 'unchanged'
+        self.reimport_keys.discard(key)
+
+        participant_id = participant_id or f"web-{safe_name(session_name)}"
+        first_time = datetime.datetime.fromisoformat(events[0]['iso_timestamp'])
+        # The session ID keeps sessions that start in the same second apart
+        filename = self.unique_filename(key, f"session_recording_{safe_name(participant_id)}_"
+                                             f"web{safe_name(session_id)}_{first_time.strftime('%Y%m%d_%H%M%S')}")
+
+        write_session_recording(self.folder / filename, participant_id, events, {
+            'Source': f"web stopwatch export {Path(source).name}",
+            'Web Session': json.dumps({'id': session_id, 'name': session_name}),
+            'Import Hash': digest
+        })
+
+        # A session that grew since the last import replaces its earlier file
+        if existing and existing['file'] != filename:
+            old_keys = self.file_keys.get(existing['file'], set())
+            old_keys.discard(key)
+            if not old_keys:
+                self.file_keys.pop(existing['file'], None)
+                old_path = self.folder / existing['file']
+                if old_path.exists():
+                    old_path.unlink()
+        self.file_keys.setdefault(filename, set()).add(key)
+
+        self.index[key] = {
+            'hash': digest,
+            'file': filename,
+            'events': len(events),
+            'imported_at': datetime.datetime.now().isoformat()
+        }
+        return 'updated' if existing else 'imported'
+
+    def import_file(self, path, participant_id=None):
+        """Import every session in a web stopwatch export. Returns a {status: count} dict."""
+        path = Path(path)
+        counts = {'imported': 0, 'updated': 0, 'unchanged': 0, 'empty': 0}
+        with open(path, newline='', encoding='utf-8') as f:
+            if path.suffix.lower() == '.csv':
+                sessions = iter_csv_sessions(f)
+            else:
+                sessions = iter_json_sessions(f)
+            for session_id, session_name, entries in sessions:
+                status = self.import_session(path, session_id, session_name, entries, participant_id)
+                counts[status] += 1
+                logger.debug(f"{path.name}: session {session_id} ({session_name}) {status}")
+        self.save_index()
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import web stopwatch exports into a session store folder.")
+    parser.add_argument("exports", nargs="+", type=Path, help="stopwatch-export.json or .csv files")
+    parser.add_argument("--store", type=Path, default=Path.home() / "Downloads",
+                        help="Folder to write session recordings to (default: Downloads)")
+    parser.add_argument("--participant", help="Participant ID for the imported sessions "
+                        "(default: derived from the stopwatch session name)")
+    args = parser.parse_args()
+
+    try:
+        store = SessionStore(args.store)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not open session store {args.store}: {e}", exc_info=True)
+        print(f"\nError opening session store: {e}")
+        sys.exit(1)
+
+    failed = False
+    for export in args.exports:
+        try:
+            counts = store.import_file(export, args.participant)
+            logger.info(f"{export}: {counts['imported']} imported, {counts['updated']} updated, "
+                        f"{counts['unchanged']} unchanged, {counts['empty']} empty")
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to import {export}: {e}", exc_info=True)
+            print(f"\nError importing {export}: {e}")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
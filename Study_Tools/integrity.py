@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Study Output Integrity Tool
+---------------------------
+Writes BLAKE2 checksums for study output files (manifests, session
+recordings, audio) and verifies them later.
+
+Each file gets a `<name>.b2` sidecar in `b2sum` format, and the folder gets a
+CHECKSUMS.json manifest recording the digest, size and modification time of
+every file. Verification re-hashes files in parallel and skips files whose
+size and modification time still match the manifest unless --full is given.
+
+Usage:
+    python integrity.py seal  <folder> [--workers N] [--full]
+    python integrity.py verify <folder> [--workers N] [--full]
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from session_data import hash_file, write_atomic
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger("study-integrity")
+
+MANIFEST_NAME = "CHECKSUMS.json"
+CHECKSUM_SUFFIX = ".b2"
+HASH_ALGORITHM = "blake2b"
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def write_sidecar(path, digest):
+    """Write a `b2sum`-compatible checksum file next to path."""
+    path = Path(path)
+    with write_atomic(path.with_name(path.name + CHECKSUM_SUFFIX)) as f:
+        f.write(f"{digest}  {path.name}\n")
+
+
+def read_sidecar(path):
+    """Return the digest stored in the sidecar for path, or None if absent."""
+    sidecar = Path(path).with_name(Path(path).name + CHECKSUM_SUFFIX)
+    try:
+        return sidecar.read_text().split()[0]
+    except (OSError, IndexError):
+        return None
+
+
+def is_tracked(path):
+    """Return True for files whose integrity should be recorded."""
+    name = path.name
+    return not (name == MANIFEST_NAME
+                or name.endswith(CHECKSUM_SUFFIX)
+                or name.endswith(".partial")
+                or name.startswith("."))
+
+
+def scan_folder(folder):
+    """Return {relative_path: os.stat_result} for every tracked file under folder."""
+    folder = Path(folder)
+    found = {}
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            path = Path(root) / name
+            if is_tracked(path):
+                found[path.relative_to(folder).as_posix()] = path.stat()
+    return found
+
+
+def load_manifest(folder):
+    """Load the folder checksum manifest, returning an empty one if missing."""
+    manifest_path = Path(folder) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {"algorithm": HASH_ALGORITHM, "files": {}}
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("algorithm") != HASH_ALGORITHM:
+        raise ValueError(f"Unsupported checksum algorithm in {manifest_path}: {manifest.get('algorithm')}")
+    return manifest
+
+
+def save_manifest(folder, manifest):
+    """Write the folder checksum manifest atomically."""
+    manifest["generated_at"] = datetime.datetime.now().isoformat()
+    with write_atomic(Path(folder) / MANIFEST_NAME) as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+
+def is_unchanged(entry, stat):
+    """Return True if a file's size and mtime still match its manifest entry."""
+    return entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+
+
+def hash_many(folder, rel_paths, workers):
+    """Hash files in parallel and return {relative_path: digest or exception}."""
+    folder = Path(folder)
+
+    def task(rel_path):
+        try:
+            return rel_path, hash_file(folder / rel_path)
+        except OSError as e:
+            return rel_path, e
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(executor.map(task, rel_paths))
+
+
+def seal(folder, workers=DEFAULT_WORKERS, full=False):
+    """
+    Record checksums for every tracked file in folder.
+    Files unchanged since the last seal are not re-hashed unless full is True.
+    Returns the number of files hashed.
+    """
+    folder = Path(folder)
+    manifest = load_manifest(folder)
+    entries = manifest["files"]
+    current = scan_folder(folder)
+
+    to_hash = [rel for rel, stat in current.items()
+               if full or rel not in entries or not is_unchanged(entries[rel], stat)]
+    logger.info(f"Sealing {folder}: {len(current)} files, {len(to_hash)} to hash")
+
+    for rel, result in hash_many(folder, to_hash, workers).items():
+        if isinstance(result, Exception):
+            logger.error(f"Could not hash {rel}: {result}")
+            continue
+        stat = current[rel]
+        entries[rel] = {"blake2b": result, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        write_sidecar(folder / rel, result)
+
+    # Drop entries for files that no longer exist
+    for rel in set(entries) - set(current):
+        logger.warning(f"Removing manifest entry for missing file: {rel}")
+        del entries[rel]
+
+    save_manifest(folder, manifest)
+    logger.info(f"Checksum manifest written to {folder / MANIFEST_NAME}")
+    return len(to_hash)
+
+
+def verify(folder, workers=DEFAULT_WORKERS, full=False):
+    """
+    Check every file recorded in the folder manifest.
+    Returns a list of (relative_path, problem) tuples; an empty list means the
+    folder is intact. Problems are 'missing', 'truncated', 'modified',
+    'unreadable', 'sidecar mismatch' and 'untracked'.
+    """
+    folder = Path(folder)
+    entries = load_manifest(folder)["files"]
+    current = scan_folder(folder)
+    problems = []
+    to_hash = []
+
+    for rel, entry in entries.items():
+        stat = current.get(rel)
+        if stat is None:
+            problems.append((rel, "missing"))
+        elif stat.st_size < entry["size"]:
+            problems.append((rel, "truncated"))
+        elif full or not is_unchanged(entry, stat):
+            to_hash.append(rel)
+
+    for rel in sorted(set(current) - set(entries)):
+        problems.append((rel, "untracked"))
+
+    logger.info(f"Verifying {folder}: {len(entries)} files recorded, {len(to_hash)} to hash")
+    for rel, result in hash_many(folder, to_hash, workers).items():
+        if isinstance(result, Exception):
+            problems.append((rel, "unreadable"))
+        elif result != entries[rel]["blake2b"]:
+            problems.append((rel, "modified"))
+
+    for rel, entry in entries.items():
+        if rel in current:
+            sidecar_digest = read_sidecar(folder / rel)
+            if sidecar_digest is not None and sidecar_digest != entry["blake2b"]:
+                problems.append((rel, "sidecar mismatch"))
+
+    return sorted(problems)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write and verify BLAKE2 checksums for study output folders.")
+    parser.add_argument("command", choices=["seal", "verify"], help="seal: record checksums, verify: check them")
+    parser.add_argument("folder", type=Path, help="Study output folder")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Number of parallel hashing threads")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-hash every file even if its size and modification time are unchanged")
+    args = parser.parse_args()
+
+    if not args.folder.is_dir():
+        logger.error(f"Not a directory: {args.folder}")
+        sys.exit(2)
+
+    try:
+        if args.command == "seal":
+            hashed = seal(args.folder, args.workers, args.full)
+            print(f"\nSealed {args.folder} ({hashed} files hashed)")
+        else:
+            problems = verify(args.folder, args.workers, args.full)
+            if problems:
+                print(f"\n{len(problems)} problem(s) found in {args.folder}:")
+                for rel, problem in problems:
+                    print(f"  {problem:<16} {rel}")
+                sys.exit(1)
+            print(f"\nAll files in {args.folder} verified")
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+        print("\nInterrupted. Exiting.")
+        sys.exit(130)
+    except (OSError, ValueError) as e:
+        logger.error(f"Integrity check failed: {e}", exc_info=True)
+        print(f"\nError: {e}")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Log Analytics
+-------------
+Builds a queryable timeline from the Session Recorder's daily
+`session_recorder_YYYYMMDD.log` files and the Manifest Generator's
+`manifest_generator.log`.
+
+Log files are read line by line and written to an SQLite index in batches,
+so memory use does not depend on log size. Each record is classified (export
+failures, invalid input, session start/end, recorded timestamps, other
+warnings and errors) and attached to the session it belongs to, with the
+session's participant ID once it is known. The index remembers how far each
+file has been read, so re-running `ingest` (or `ingest --follow`) only reads
+new lines. Rotated or truncated files are re-read from the start.
+
+Usage:
+    python log_analytics.py ingest [PATH ...] [--follow] [--min-level LEVEL]
+    python log_analytics.py query [--category C] [--level L] [--since WHEN] [--until WHEN]
+                                  [--participant ID] [--session N] [--search TEXT] [--json]
+    python log_analytics.py sessions [--participant ID] [--status S] [--since WHEN] [--json]
+
+WHEN is an ISO date/time or a relative age such as 30d, 12h or 90m.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stderr)
+    ]
+)
+logger = logging.getLogger("log-analytics")
+
+DEFAULT_INDEX = os.path.join(str(Path.home()), ".session_recorder_cache", "log_index.sqlite3")
+DEFAULT_LOG_PATHS = [
+    os.path.join(str(Path.home()), ".session_recorder_logs"),
+    "manifest_generator.log"
+]
+LOG_FILE_PATTERNS = ["session_recorder_*.log", "manifest_generator.log"]
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+BATCH_SIZE = 1000
+SIGNATURE_BYTES = 256
+
+# Matches the format both components configure with logging.basicConfig
+RECORD_PATTERN = re.compile(
+    r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),(\d{3}) - (.+?) - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - (.*)$'
+)
+
+# First matching rule wins; unmatched warnings and errors fall back to their level
+CATEGORY_RULES = [
+    ("export_failure", re.compile(r'^Failed to export|^Error writing file')),
+    # A failed attempt is retried, so it is not an export failure on its own
+    ("export_retry", re.compile(r'^Export attempt \d+ .* failed')),
+    ("export_success", re.compile(r'^Successfully exported|^Data successfully saved|^Session data saved')),
+    ("invalid_input", re.compile(r'^User entered|^Invalid |^No participant ID provided')),
+    ("session_start", re.compile(r'^Starting recording session|^Starting manifest generator')),
+    ("session_end", re.compile(r'^Ending recording session|^Manifest generator completed')),
+    ("timestamp", re.compile(r'^Timestamp #\d+ recorded')),
+]
+
+PARTICIPANT_SET = re.compile(r'^Participant ID set to: (.+)$')
+RECORDER_SAVED = re.compile(r'^Session data saved for participant (.+?) to (.+)$')
+# Recorder exports finish after the session has ended, possibly after the next one started
+EXPORT_WRITTEN = re.compile(r'^Successfully exported \d+ timestamps to (.+)$')
+EXPORT_FALLBACK = re.compile(r'^Could not save to .+; data saved to (.+)$')
+EXPORT_BACKUP = re.compile(r'^Session export failed, using backup at .*session_backup_(.+)\.json$')
+NO_EXPORT = re.compile(r'^Session ended with no data to save')
+RECORDING_FILE = re.compile(r'session_recording_(.+)_\d{8}_\d{6}\.csv$')
+MAX_PENDING_EXPORTS = 20
+MANIFEST_SAVED = re.compile(r'^Data successfully saved to (.*participant_(.+?)(?:_\d{8}_\d{6})?\.json)$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    signature TEXT,
+    offset INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    component TEXT NOT NULL,
+    participant_id TEXT,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    export_path TEXT
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    ts TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    component TEXT NOT NULL,
+    category TEXT,
+    session_id INTEGER,
+    participant_id TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_ts ON records (ts);
+CREATE INDEX IF NOT EXISTS records_category_ts ON records (category, ts);
+CREATE INDEX IF NOT EXISTS records_level_ts ON records (level, ts);
+CREATE INDEX IF NOT EXISTS records_session ON records (session_id);
+CREATE INDEX IF NOT EXISTS records_participant ON records (participant_id);
+CREATE INDEX IF NOT EXISTS sessions_participant ON sessions (participant_id);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started_at);
+"""
+
+
+def categorize(level, message):
+    """Return the category of a log message, or None for routine records."""
+    for category, pattern in CATEGORY_RULES:
+        if pattern.search(message):
+            return category
+    if level >= LEVELS["ERROR"]:
+        return "error"
+    if level >= LEVELS["WARNING"]:
+        return "warning"
+    return None
+
+
+def parse_when(value):
+    """Parse an ISO date/time or a relative age (30d, 12h, 90m) into an ISO string."""
+    match = re.fullmatch(r'(\d+)([dhm])', value)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"d": datetime.timedelta(days=amount),
+                 "h": datetime.timedelta(hours=amount),
+                 "m": datetime.timedelta(minutes=amount)}[unit]
+        return (datetime.datetime.now() - delta).isoformat(sep=' ', timespec='milliseconds')
+    return datetime.datetime.fromisoformat(value).isoformat(sep=' ', timespec='milliseconds')
+
+
+def find_log_files(paths):
+    """Expand directories into the log files they contain."""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            for pattern in LOG_FILE_PATTERNS:
+                found.extend(sorted(path.glob(pattern)))
+        elif path.is_file():
+            found.append(path)
+    return found
+
+
+class LogIndex:
+    """SQLite index of parsed log records and the sessions they belong to."""
+
+    def __init__(self, index_path=DEFAULT_INDEX, min_level="DEBUG"):
+        Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(index_path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self.min_level = LEVELS[min_level]
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def _signature(path, length=SIGNATURE_BYTES):
+        """Return 'length:digest' for the first bytes of a file, used to spot replaced logs."""
+        with open(path, "rb") as f:
+            head = f.read(length)
+        return f"{len(head)}:{hashlib.blake2b(head, digest_size=16).hexdigest()}"
+
+    def ingest_file(self, path):
+        """Read new lines from a log file into the index. Returns the number of records added."""
+        path = Path(path).resolve()
+        size = path.stat().st_size
+        row = self.db.execute("SELECT * FROM files WHERE path = ?", (str(path),)).fetchone()
+        if row is None:
+            file_id = self.db.execute("INSERT INTO files (path) VALUES (?)", (str(path),)).lastrowid
+            offset, state, signature = 0, {}, None
+        else:
+            file_id, offset, state, signature = row["id"], row["offset"], json.loads(row["state"]), row["signature"]
+
+        # A shrunken file or changed first bytes means the log was rotated or replaced
+        if offset > size or (signature and self._signature(path, int(signature.split(":")[0])) != signature):
+            logger.info(f"{path.name} was truncated or replaced; re-reading from the start")
+            offset, state = 0, {}
+            self.db.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+            self.db.execute("DELETE FROM sessions WHERE file_id = ?", (file_id,))
+
+        added = 0
+        batch = []
+        pending = None  # Record still collecting traceback continuation lines
+        # Continuation lines before the first record belong to the last record of the previous ingest
+        previous_record_id = state.get("last_record_id")
+        last_kept = previous_record_id is not None
+
+        def flush_pending():
+            nonlocal pending
+            if pending is not None:
+                batch.append(pending)
+                pending = None
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while True:
+                raw = f.readline()
+                if not raw.endswith(b"\n"):
+                    break  # Partial line still being written; pick it up next time
+                offset += len(raw)
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                match = RECORD_PATTERN.match(line)
+                if not match:
+                    if pending is not None:
+                        pending["message"] += "\n" + line
+                    elif previous_record_id and line:
+                        self.db.execute("UPDATE records SET message = message || ? WHERE id = ?",
+                                        ("\n" + line, previous_record_id))
+                    continue
+
+                previous_record_id = None
+                flush_pending()
+                if len(batch) >= BATCH_SIZE:
+                    added += self._write_batch(batch, state)
+
+                stamp, millis, component, level_name, message = match.groups()
+                ts = f"{stamp}.{millis}"
+                level = LEVELS[level_name]
+                category = categorize(level, message)
+                session_id, participant_id = self._track_session(file_id, state, ts, component, category, message)
+                if level < self.min_level and category is None:
+                    last_kept = False
+                    continue
+                last_kept = True
+                pending = {
+                    "file_id": file_id, "ts": ts, "level": level, "component": component,
+                    "category": category, "session_id": session_id,
+                    "participant_id": participant_id,
+                    "message": message
+                }
+
+        flush_pending()
+        added += self._write_batch(batch, state)
+        if not last_kept:
+            state["last_record_id"] = None
+        self.db.execute("UPDATE files SET offset = ?, state = ?, signature = ? WHERE id = ?",
+                        (offset, json.dumps(state), self._signature(path), file_id))
+        self.db.commit()
+        return added
+
+    def _write_batch(self, batch, state):
+        if not batch:
+            return 0
+        cursor = self.db.cursor()
+        for record in batch:
+            cursor.execute(
+                "INSERT INTO records (file_id, ts, level, component, category, session_id, participant_id, message) "
+                "VALUES (:file_id, :ts, :level, :component, :category, :session_id, :participant_id, :message)",
+                record)
+        state["last_record_id"] = cursor.lastrowid
+        count = len(batch)
+        batch.clear()
+        return count
+
+    def _track_session(self, file_id, state, ts, component, category, message):
+        """
+        Update per-component session state for a record.
+        Returns the (session_id, participant_id) the record belongs to.
+        """
+        sessions = state.setdefault("sessions", {})
+        current = sessions.get(component)
+
+        if category == "session_start":
+            if current:
+                # The previous run never logged its end (e.g. it crashed)
+                self.db.execute("UPDATE sessions SET status = 'incomplete' WHERE id = ? AND status = 'open'",
+                                (current["id"],))
+            session_id = self.db.execute(
+                "INSERT INTO sessions (file_id, component, started_at) VALUES (?, ?, ?)",
+                (file_id, component, ts)).lastrowid
+            sessions[component] = {"id": session_id, "participant_id": None}
+            return session_id, None
+
+        if component != "manifest-generator":
+            exported = self._track_export(state, category, message)
+            if exported:
+                return exported
+
+        if current is None:
+            return None, None
+        session_id = current["id"]
+
+        participant = None
+        export_path = None
+        match = PARTICIPANT_SET.match(message)
+        if match:
+            participant = match.group(1)
+        match = MANIFEST_SAVED.match(message)
+        if match:
+            export_path = match.group(1)
+            # Export messages only fill in a missing participant, never replace it
+            if not current["participant_id"]:
+                participant = match.group(2)
+
+        if participant:
+            current["participant_id"] = participant
+            self.db.execute("UPDATE sessions SET participant_id = ? WHERE id = ?", (participant, session_id))
+        if category == "export_success" and export_path:
+            self.db.execute("UPDATE sessions SET status = 'exported', export_path = ? WHERE id = ?",
+                            (export_path, session_id))
+        elif category == "export_failure":
+            self.db.execute("UPDATE sessions SET status = 'export_failed' WHERE id = ? AND status != 'exported'",
+                            (session_id,))
+        elif category == "session_end":
+            self.db.execute("UPDATE sessions SET ended_at = ? WHERE id = ?", (ts, session_id))
+            self.db.execute("UPDATE sessions SET status = 'ended' WHERE id = ? AND status = 'open'", (session_id,))
+            del sessions[component]
+            if component != "manifest-generator":
+                # The recorder exports in the background after the session ends
+                exports = state.setdefault("exports", [])
+                exports.append({"id": session_id, "participant_id": current["participant_id"],
+                                "export_path": None})
+                del exports[:-MAX_PENDING_EXPORTS]
+        return session_id, current["participant_id"]
+
+    def _track_export(self, state, category, message):
+        """
+        Attribute a recorder export message to the ended session it belongs to,
+        matched by export path, then participant, then oldest first.
+        Returns (session_id, participant_id), or None if it is not an export message.
+        """
+        exports = state.get("exports")
+        if not exports:
+            return None
+
+        participant = path = None
+        finished = False
+        match = EXPORT_WRITTEN.match(message) or EXPORT_FALLBACK.match(message)
+        if match:
+            path = match.group(1)
+            match = RECORDING_FILE.search(path)
+            participant = match.group(1) if match else None
+        elif RECORDER_SAVED.match(message):
+            participant, path = RECORDER_SAVED.match(message).groups()
+            finished = True
+        elif EXPORT_BACKUP.match(message):
+            participant = EXPORT_BACKUP.match(message).group(1)
+            finished = True
+        elif NO_EXPORT.match(message):
+            # Logged right after the end of the session it belongs to
+            entry = exports.pop()
+            return entry["id"], entry["participant_id"]
+        elif category not in ("export_failure", "export_retry"):
+            return None
+
+        entry = next((e for e in exports if path and e["export_path"] == path), None)
+        if entry is None and participant:
+            entry = next((e for e in exports if e["participant_id"] == participant and not e["export_path"]), None)
+        if entry is None:
+            entry = next((e for e in exports if not e["export_path"]), exports[0])
+
+        if category == "export_success" and path:
+            entry["export_path"] = path
+            self.db.execute("UPDATE sessions SET status = 'exported', export_path = ? WHERE id = ?",
+                            (path, entry["id"]))
+        elif category == "export_failure":
+            self.db.execute("UPDATE sessions SET status = 'export_failed' WHERE id = ? AND status != 'exported'",
+                            (entry["id"],))
+        if finished:
+            exports.remove(entry)
+        return entry["id"], entry["participant_id"]
+
+    def query(self, category=None, min_level=None, since=None, until=None,
+              participant=None, session=None, search=None, limit=None):
+        """Return matching records, newest first, joined with their session."""
+        clauses, params = [], []
+        if category:
+            clauses.append("r.category = ?")
+            params.append(category)
+        if min_level:
+            clauses.append("r.level >= ?")
+            params.append(LEVELS[min_level])
+        if since:
+            clauses.append("r.ts >= ?")
+            params.append(since)
+        if until:
+            clauses.append("r.ts < ?")
+            params.append(until)
+        if participant:
+            clauses.append("COALESCE(s.participant_id, r.participant_id) = ?")
+            params.append(participant)
+        if session:
+            clauses.append("r.session_id = ?")
+            params.append(session)
+        if search:
+            clauses.append("r.message LIKE ?")
+            params.append(f"%{search}%")
+
+        sql = ("SELECT r.ts, r.level, r.component, r.category, r.session_id, "
+               "COALESCE(s.participant_id, r.participant_id) AS participant_id, "
+               "s.started_at AS session_started_at, s.status AS session_status, r.message "
+               "FROM records r LEFT JOIN sessions s ON s.id = r.session_id")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY r.ts DESC, r.id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        results = []
+        for row in self.db.execute(sql, params):
+            result = dict(row)
+            result["level"] = LEVEL_NAMES[result["level"]]
+            results.append(result)
+        return results
+
+    def sessions(self, participant=None, status=None, since=None, limit=None):
+        """Return sessions with their record and error counts, newest first."""
+        clauses, params = [], []
+        if participant:
+            clauses.append("s.participant_id = ?")
+            params.append(participant)
+        if status:
+            clauses.append("s.status = ?")
+            params.append(status)
+        if since:
+            clauses.append("s.started_at >= ?")
+            params.append(since)
+
+        sql = ("SELECT s.id, s.component, s.participant_id, s.started_at, s.ended_at, s.status, s.export_path, "
+               "COUNT(r.id) AS records, "
+               "SUM(CASE WHEN r.category = 'timestamp' THEN 1 ELSE 0 END) AS timestamps, "
+               "SUM(CASE WHEN r.level >= 30 THEN 1 ELSE 0 END) AS warnings "
+               "FROM sessions s LEFT JOIN records r ON r.session_id = s.id")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " GROUP BY s.id ORDER BY s.started_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+
+def print_records(records):
+    for record in reversed(records):
+        session = f"session {record['session_id']}" if record['session_id'] else "no session"
+        participant = f"participant {record['participant_id']}" if record['participant_id'] else ""
+        print(f"{record['ts']}  {record['level']:<8} {record['component']:<18} "
+              f"[{record['category'] or '-'}] ({session} {participant}".rstrip() + ")")
+        print(f"    {record['message']}")
+
+
+def print_sessions(sessions):
+    print(f"{'ID':>5}  {'Component':<18} {'Participant':<12} {'Started':<23} {'Status':<14} "
+          f"{'Stamps':>6} {'Warn':>5}  Export")
+    for s in sessions:
+        print(f"{s['id']:>5}  {s['component']:<18} {s['participant_id'] or '-':<12} {s['started_at']:<23} "
+              f"{s['status']:<14} {s['timestamps'] or 0:>6} {s['warnings'] or 0:>5}  {s['export_path'] or ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and query Session Stopwatcher log files.")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="Path of the SQLite log index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Read new log lines into the index")
+    ingest_parser.add_argument("paths", nargs="*", default=DEFAULT_LOG_PATHS,
+                               help="Log files or directories (default: recorder log folder and ./manifest_generator.log)")
+    ingest_parser.add_argument("--min-level", choices=list(LEVELS), default="INFO",
+                               help="Lowest level stored for uncategorized records (default INFO)")
+    ingest_parser.add_argument("--follow", action="store_true", help="Keep watching the logs for new lines")
+    ingest_parser.add_argument("--interval", type=float, default=2.0, help="Seconds between checks with --follow")
+
+    for name, help_text in (("query", "Search indexed log records"), ("sessions", "List indexed sessions")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--participant", help="Only this participant ID")
+        sub.add_argument("--since", type=parse_when, help="Start of the time range (ISO or 30d/12h/90m)")
+        sub.add_argument("--limit", type=int, help="Maximum number of results")
+        sub.add_argument("--json", action="store_true", help="Print results as JSON")
+        if name == "query":
+            sub.add_argument("--until", type=parse_when, help="End of the time range (ISO or 30d/12h/90m)")
+            sub.add_argument("--category", choices=[rule[0] for rule in CATEGORY_RULES] + ["error", "warning"],
+                             help="Only records in this category")
+            sub.add_argument("--level", choices=list(LEVELS), help="Only records at or above this level")
+            sub.add_argument("--session", type=int, help="Only records from this session ID")
+            sub.add_argument("--search", help="Only records whose message contains this text")
+        else:
+            sub.add_argument("--status", choices=["open", "ended", "exported", "export_failed", "incomplete"],
+                             help="Only sessions with this status")
+
+    args = parser.parse_args()
+
+    try:
+        index = LogIndex(args.index, getattr(args, "min_level", "DEBUG"))
+    except sqlite3.Error as e:
+        logger.error(f"Could not open log index {args.index}: {e}", exc_info=True)
+        sys.exit(1)
+
+    try:
+        if args.command == "ingest":
+            while True:
+                for log_path in find_log_files(args.paths):
+                    try:
+                        added = index.ingest_file(log_path)
+                    except OSError as e:
+                        logger.error(f"Could not read {log_path}: {e}")
+                        continue
+                    if added:
+                        logger.info(f"{log_path.name}: {added} new records")
+                if not args.follow:
+                    break
+                time.sleep(args.interval)
+        elif args.command == "query":
+            records = index.query(args.category, args.level, args.since, args.until,
+                                  args.participant, args.session, args.search, args.limit)
+            if args.json:
+                print(json.dumps(records, indent=2))
+            else:
+                print_records(records)
+                print(f"\n{len(records)} record(s)")
+        else:
+            sessions = index.sessions(args.participant, args.status, args.since, args.limit)
+            if args.json:
+                print(json.dumps(sessions, indent=2))
+            else:
+                print_sessions(sessions)
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Session Data Helpers
+--------------------
+Shared readers and writers for the files produced by the Session Stopwatcher
+components, and the hashing and atomic-write helpers used by the study tools.
+
+Session recordings written by Recording_Session/session_recorder.py are CSV
+files whose header row is followed by `# Key: value` metadata comment lines
+and then one row per recorded timestamp.
+"""
+
+import contextlib
+import csv
+import datetime
+import hashlib
+import os
+from pathlib import Path
+
+# Columns written by the session recorder for every timestamp
+SESSION_FIELDNAMES = ['timestamp_id', 'date', 'hour', 'minute', 'second',
+                      'millisecond', 'iso_timestamp', 'notes']
+
+SESSION_RECORDING_GLOB = "session_recording_*.csv"
+
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+def hash_file(path):
+    """Return the hex BLAKE2b digest of a file, read in fixed-size chunks."""
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(READ_BUFFER_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def write_atomic(path, mode="w", **open_kwargs):
+    """
+    Open a temporary file next to path for writing, then fsync it and rename
+    it over path when the block completes, so readers never see a partial
+    file. The temporary file is removed if the block raises.
+    """
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.partial")
+    try:
+        with open(temp_path, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+
+def iso_to_seconds(iso_timestamp):
+    """Convert an ISO format timestamp to seconds since the epoch."""
+    return datetime.datetime.fromisoformat(iso_timestamp).timestamp()
+
+
+def event_from_time(timestamp_id, event_time, notes=''):
+    """Build a row in the session recorder's format from a datetime."""
+    return {
+        'timestamp_id': timestamp_id,
+        'date': event_time.strftime("%Y-%m-%d"),
+        'hour': event_time.hour,
+        'minute': event_time.minute,
+        'second': event_time.second,
+        'millisecond': event_time.microsecond // 1000,
+        'iso_timestamp': event_time.isoformat(),
+        'notes': notes
+    }
+
+
+def write_session_recording(path, participant_id, events, extra_metadata=None):
+    """
+    Write events in the session recorder's CSV format.
+    The file is written under a temporary name and renamed into place.
+    extra_metadata is an optional {key: value} dict of additional comment lines.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    start_date = events[0]['date'] if events else ''
+
+    with write_atomic(path, newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=SESSION_FIELDNAMES)
+        writer.writeheader()
+        csvfile.write(f"# Session Recording for Participant: {participant_id}\n")
+        csvfile.write(f"# Date: {start_date}\n")
+        csvfile.write(f"# Total Timestamps: {len(events)}\n")
+        for key, value in (extra_metadata or {}).items():
+            csvfile.write(f"# {key}: {value}\n")
+        writer.writerows(events)
+
+
+def read_session_recording(path):
+    """
+    Read a session recording CSV.
+
+    Returns a dict with the file path, participant ID, the metadata comment
+    lines as a {key: value} dict and the events in file order. Each event has
+    its timestamp_id, iso_timestamp, notes and 'time' in seconds since the epoch.
+    """
+    path = Path(path)
+    metadata = {}
+    events = []
+
+    with open(path, newline='') as f:
+        def data_lines():
+            for line in f:
+                if line.startswith('#'):
+                    key, _, value = line[1:].strip().partition(': ')
+                    metadata[key] = value
+                else:
+                    yield line
+
+        for row in csv.DictReader(data_lines()):
+            if not row.get('iso_timestamp'):
+                continue
+            events.append({
+                'timestamp_id': int(row['timestamp_id']),
+                'iso_timestamp': row['iso_timestamp'],
+                'time': iso_to_seconds(row['iso_timestamp']),
+                'notes': row.get('notes') or ''
+            })
+
+    participant_id = metadata.get("Session Recording for Participant")
+    if participant_id is None:
+        # Fall back to the session_recording_<ID>_<YYYYMMDD>_<HHMMSS>.csv naming
+        parts = path.stem.split('_')
+        participant_id = '_'.join(parts[2:-2]) if len(parts) > 4 else None
+
+    return {
+        'path': str(path),
+        'participant_id': participant_id,
+        'metadata': metadata,
+        'events': events
+    }
@@ -0,0 +1,127 @@
+"""
+Study Computation Cache
+-----------------------
+An on-disk memo of results derived from individual study files, so
+study-level analyses only recompute what changed.
+
+Entries are keyed by a namespace (the name and version of the computation)
+and the file's absolute path. A cached result is reused while the file's size
+and modification time are unchanged. With verify_content=True, a file at the
+same path whose size or modification time changed is hashed, and the result
+is still reused if its BLAKE2 content hash matches (e.g. after `touch` or
+restoring the file in place). Files at a new path, such as a copied study
+folder, are always recomputed, since results may depend on the file name.
+The store is an SQLite database bounded by total result size, evicting the
+least recently used entries first.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from session_data import hash_file
+
+DEFAULT_CACHE_PATH = os.path.join(str(Path.home()), ".session_recorder_cache", "study_cache.sqlite3")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT,
+    value TEXT NOT NULL,
+    value_bytes INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (namespace, path)
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+class FileCache:
+    """Size-bounded LRU cache of JSON-serializable per-file results."""
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(cache_path)
+        self.db.executescript(SCHEMA)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """Evict down to the size limit, save and close the cache."""
+        self.evict()
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_or_compute(self, namespace, path, compute, verify_content=False):
+        """
+        Return compute(path) for a file, reusing the cached result when the
+        file is unchanged. compute must return a JSON-serializable value.
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = (namespace, str(path))
+        now = time.time()
+        row = self.db.execute(
+            "SELECT size, mtime_ns, content_hash, value FROM entries WHERE namespace = ? AND path = ?",
+            key).fetchone()
+
+        if row is not None:
+            size, mtime_ns, stored_hash, value = row
+            if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+                self.db.execute("UPDATE entries SET last_used = ? WHERE namespace = ? AND path = ?",
+                                (now, *key))
+                self.hits += 1
+                return json.loads(value)
+            if verify_content and stored_hash and stored_hash == hash_file(path):
+                self.db.execute(
+                    "UPDATE entries SET size = ?, mtime_ns = ?, last_used = ? WHERE namespace = ? AND path = ?",
+                    (stat.st_size, stat.st_mtime_ns, now, *key))
+                self.hits += 1
+                return json.loads(value)
+
+        self.misses += 1
+        result = compute(path)
+        value = json.dumps(result)
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(namespace, path, size, mtime_ns, content_hash, value, value_bytes, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (*key, stat.st_size, stat.st_mtime_ns, hash_file(path) if verify_content else None,
+             value, len(value), now))
+        return result
+
+    def evict(self):
+        """Remove least recently used entries until the cache is within max_bytes."""
+        total = self.db.execute("SELECT COALESCE(SUM(value_bytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        rows = self.db.execute("SELECT namespace, path, value_bytes FROM entries ORDER BY last_used").fetchall()
+        for namespace, path, value_bytes in rows:
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM entries WHERE namespace = ? AND path = ?", (namespace, path))
+            total -= value_bytes
+            removed += 1
+        return removed
+
+    def clear(self, namespace=None):
+        """Remove all entries, or only those for one namespace."""
+        if namespace is None:
+            self.db.execute("DELETE FROM entries")
+        else:
+            self.db.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+        self.db.commit()
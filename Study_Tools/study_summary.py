@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Study Summary
+-------------
+Summarizes a study output folder per participant: sessions, event counts,
+recorded duration and inter-event interval statistics, alongside each
+participant's manifest details.
+
+Per-file summaries are memoized in the study computation cache
+(study_cache.py), so refreshing a study after adding one session only reads
+that session. Interval statistics are stored per file as count, mean and sum
+of squared deviations, and merged across files without revisiting events.
+
+Usage:
+    python study_summary.py FOLDER [--json] [--verify-content] [--cache PATH] [--max-cache-mb N]
+"""
+
+import argparse
+import json
+import logging
+import math
+import sys
+import time
+from pathlib import Path
+
+from session_data import SESSION_RECORDING_GLOB, read_session_recording
+from study_cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES, FileCache
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stderr)
+    ]
+)
+logger = logging.getLogger("study-summary")
+
+# Bump a version when its computation changes so stale cache entries are ignored
+RECORDING_NAMESPACE = "recording_summary:v1"
+MANIFEST_NAMESPACE = "manifest_summary:v1"
+MANIFEST_GLOB = "participant_*.json"
+MANIFEST_FIELDS = ["date", "participant_initials", "assigned_subject_knowledge",
+                   "methods_of_analysis", "audio_recording"]
+
+
+def summarize_recording(path):
+    """Summarize one session recording in a single pass over its events."""
+    recording = read_session_recording(path)
+    times = sorted(event['time'] for event in recording['events'])
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    longest_gap = 0.0
+    for previous, current in zip(times, times[1:]):
+        interval = current - previous
+        count += 1
+        delta = interval - mean
+        mean += delta / count
+        m2 += delta * (interval - mean)
+        longest_gap = max(longest_gap, interval)
+
+    return {
+        'participant_id': recording['participant_id'],
+        'events': len(times),
+        'notes': sum(1 for event in recording['events'] if event['notes']),
+        'first_event': times[0] if times else None,
+        'duration_s': times[-1] - times[0] if times else 0.0,
+        'intervals': {'count': count, 'mean': mean, 'm2': m2, 'longest_gap': longest_gap}
+    }
+
+
+def summarize_manifest(path):
+    """Extract the participant ID and key fields from a manifest."""
+    with open(path) as f:
+        data = json.load(f)
+    summary = {field: data.get(field) for field in MANIFEST_FIELDS}
+    summary['participant_id'] = str(data.get('participant_id', ''))
+    return summary
+
+
+def merge_intervals(a, b):
+    """Combine two interval summaries (Chan et al. parallel variance)."""
+    count = a['count'] + b['count']
+    if count == 0:
+        return dict(a)
+    delta = b['mean'] - a['mean']
+    return {
+        'count': count,
+        'mean': a['mean'] + delta * b['count'] / count,
+        'm2': a['m2'] + b['m2'] + delta * delta * a['count'] * b['count'] / count,
+        'longest_gap': max(a['longest_gap'], b['longest_gap'])
+    }
+
+
+def summarize_study(folder, cache, verify_content=False):
+    """Return {participant_id: rollup} for a study folder, using cached per-file summaries."""
+    folder = Path(folder)
+    participants = {}
+
+    def participant(participant_id):
+        return participants.setdefault(participant_id, {
+            'participant_id': participant_id,
+            'manifest': None,
+            'sessions': 0,
+            'events': 0,
+            'notes': 0,
+            'duration_s': 0.0,
+            'first_session': None,
+            'intervals': {'count': 0, 'mean': 0.0, 'm2': 0.0, 'longest_gap': 0.0}
+        })
+
+    for path in sorted(folder.rglob(MANIFEST_GLOB)):
+        try:
+            summary = cache.get_or_compute(MANIFEST_NAMESPACE, path, summarize_manifest, verify_content)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable manifest {path}: {e}")
+            continue
+        if summary['participant_id']:
+            participant(summary['participant_id'])['manifest'] = summary
+
+    for path in sorted(folder.rglob(SESSION_RECORDING_GLOB)):
+        try:
+            summary = cache.get_or_compute(RECORDING_NAMESPACE, path, summarize_recording, verify_content)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Skipping unreadable recording {path}: {e}")
+            continue
+        rollup = participant(summary['participant_id'] or 'unknown')
+        rollup['sessions'] += 1
+        rollup['events'] += summary['events']
+        rollup['notes'] += summary['notes']
+        rollup['duration_s'] += summary['duration_s']
+        if summary['first_event'] is not None and (
+                rollup['first_session'] is None or summary['first_event'] < rollup['first_session']):
+            rollup['first_session'] = summary['first_event']
+        rollup['intervals'] = merge_intervals(rollup['intervals'], summary['intervals'])
+
+    for rollup in participants.values():
+        intervals = rollup.pop('intervals')
+        rollup['mean_interval_s'] = round(intervals['mean'], 3)
+        rollup['interval_sd_s'] = (round(math.sqrt(intervals['m2'] / (intervals['count'] - 1)), 3)
+                                   if intervals['count'] > 1 else 0.0)
+        rollup['longest_gap_s'] = round(intervals['longest_gap'], 3)
+        rollup['duration_s'] = round(rollup['duration_s'], 3)
+    return participants
+
+
+def print_summary(participants):
+    print(f"{'Participant':<14} {'Manifest':<9} {'Sessions':>8} {'Events':>9} {'Notes':>7} "
+          f"{'Duration':>10} {'Mean int.':>10} {'SD int.':>9} {'Max gap':>9}")
+    for pid in sorted(participants):
+        p = participants[pid]
+        hours, remainder = divmod(int(p['duration_s']), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        print(f"{pid:<14} {'yes' if p['manifest'] else 'no':<9} {p['sessions']:>8} {p['events']:>9} "
+              f"{p['notes']:>7} {hours:>4}:{minutes:02d}:{seconds:02d} {p['mean_interval_s']:>9.2f}s "
+              f"{p['interval_sd_s']:>8.2f}s {p['longest_gap_s']:>8.1f}s")
+    total_events = sum(p['events'] for p in participants.values())
+    total_sessions = sum(p['sessions'] for p in participants.values())
+    print(f"\n{len(participants)} participants, {total_sessions} sessions, {total_events:,} events")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a study output folder per participant.")
+    parser.add_argument("folder", type=Path, help="Study output folder")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser.add_argument("--verify-content", action="store_true",
+                        help="Reuse cached results for files whose contents are unchanged even if "
+                             "their modification time changed (hashes changed files)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Path of the computation cache")
+    parser.add_argument("--max-cache-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Maximum cache size in MB before least recently used entries are evicted")
+    parser.add_argument("--clear-cache", action="store_true", help="Discard cached results first")
+    args = parser.parse_args()
+
+    if not args.folder.is_dir():
+        logger.error(f"Not a directory: {args.folder}")
+        sys.exit(2)
+
+    started = time.perf_counter()
+    with FileCache(args.cache, int(args.max_cache_mb * 1024 * 1024)) as cache:
+        if args.clear_cache:
+            cache.clear()
+        participants = summarize_study(args.folder, cache, args.verify_content)
+        logger.info(f"Summarized {args.folder} in {time.perf_counter() - started:.3f} s "
+                    f"({cache.hits} cached, {cache.misses} computed)")
+
+    if args.json:
+        print(json.dumps(participants, indent=2, sort_keys=True))
+    else:
+        print_summary(participants)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+WAV Cue Marker Writer
+---------------------
+Embeds the events from a session recording into one or two WAV files as RIFF
+`cue ` markers with `LIST adtl` labels, so audio editors show each recorded
+event (and its notes) on the audio timeline.
+
+The audio samples are never loaded. The tool walks the RIFF chunk headers by
+seeking, then appends the marker chunks at the end of the file and patches
+the RIFF size in place. Markers written by an earlier run are replaced: if
+they sit at the end of the file it is truncated before appending, otherwise
+the file is stream-copied through a fixed-size buffer without them and
+renamed into place.
+
+The audio start time is taken from --audio-start if given, otherwise from a
+Broadcast WAV `bext` chunk, otherwise estimated as the file's modification
+time minus its duration (a warning is logged).
+
+Usage:
+    python wav_cues.py RECORDING.csv AUDIO.wav [AUDIO.wav] [--audio-start ISO] [--offset SECONDS]
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import struct
+import sys
+from pathlib import Path
+
+from session_data import read_session_recording, write_atomic
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger("wav-cues")
+
+COPY_BUFFER_SIZE = 1024 * 1024
+MAX_RIFF_SIZE = 0xFFFFFFFF
+
+
+class WavFormatError(ValueError):
+    """Raised when a file is not a WAV file this tool can update."""
+
+
+def read_chunks(f):
+    """
+    Walk the chunks of a RIFF/WAVE file without reading their contents.
+    Returns a list of (chunk_id, offset, size, list_type) tuples, where offset
+    is the position of the 8-byte chunk header and list_type is set for LIST chunks.
+    """
+    f.seek(0, os.SEEK_END)
+    file_size = f.tell()
+    f.seek(0)
+    header = f.read(12)
+    if len(header) < 12 or header[8:12] != b'WAVE':
+        raise WavFormatError("Not a WAVE file")
+    if header[:4] != b'RIFF':
+        raise WavFormatError(f"Unsupported container {header[:4]!r} (only RIFF is supported)")
+
+    chunks = []
+    offset = 12
+    while offset + 8 <= file_size:
+        f.seek(offset)
+        chunk_id, size = struct.unpack('<4sI', f.read(8))
+        list_type = f.read(4) if chunk_id == b'LIST' and size >= 4 else None
+        chunks.append((chunk_id, offset, size, list_type))
+        offset += 8 + size + (size & 1)
+    return chunks
+
+
+def find_chunk(chunks, chunk_id):
+    for chunk in chunks:
+        if chunk[0] == chunk_id:
+            return chunk
+    return None
+
+
+def read_format(f, chunks):
+    """Return (sample_rate, block_align, frame_count) from the fmt and data chunks."""
+    fmt = find_chunk(chunks, b'fmt ')
+    data = find_chunk(chunks, b'data')
+    if fmt is None or data is None:
+        raise WavFormatError("Missing fmt or data chunk")
+    f.seek(fmt[1] + 8)
+    _, _, sample_rate, _, block_align = struct.unpack('<HHIIH', f.read(14))
+    if sample_rate == 0 or block_align == 0:
+        raise WavFormatError("Invalid fmt chunk")
+    return sample_rate, block_align, data[2] // block_align
+
+
+def read_bext_start(f, chunks, sample_rate):
+    """Return the recording start time from a Broadcast WAV bext chunk, or None."""
+    bext = find_chunk(chunks, b'bext')
+    if bext is None or bext[2] < 346:
+        return None
+    f.seek(bext[1] + 8 + 320)
+    raw = f.read(26)
+    date_str = raw[:10].decode('ascii', 'replace')
+    time_str = raw[10:18].decode('ascii', 'replace').replace('-', ':').replace('.', ':')
+    time_reference = struct.unpack('<Q', raw[18:26])[0]
+    try:
+        midnight = datetime.datetime.strptime(date_str.replace(':', '-').replace('/', '-'), "%Y-%m-%d")
+    except ValueError:
+        return None
+    if time_reference:
+        # TimeReference counts samples since midnight
+        return midnight + datetime.timedelta(seconds=time_reference / sample_rate)
+    try:
+        return datetime.datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+def build_cue_chunks(cues):
+    """
+    Build the `cue ` and `LIST adtl` chunks for a list of (sample_offset, label) tuples.
+    Cue IDs are numbered from 1 in list order.
+    """
+    cue_body = struct.pack('<I', len(cues))
+    labels = b''
+    for cue_id, (sample_offset, label) in enumerate(cues, start=1):
+        cue_body += struct.pack('<II4sIII', cue_id, sample_offset, b'data', 0, 0, sample_offset)
+        text = label.encode('utf-8') + b'\x00'
+        labl_body = struct.pack('<I', cue_id) + text
+        labels += b'labl' + struct.pack('<I', len(labl_body)) + labl_body + (b'\x00' if len(labl_body) & 1 else b'')
+
+    adtl_body = b'adtl' + labels
+    return (b'cue ' + struct.pack('<I', len(cue_body)) + cue_body
+            + b'LIST' + struct.pack('<I', len(adtl_body)) + adtl_body)
+
+
+def is_marker_chunk(chunk):
+    return chunk[0] == b'cue ' or (chunk[0] == b'LIST' and chunk[3] == b'adtl')
+
+
+def write_cues(path, cues):
+    """
+    Replace any existing cue markers in a WAV file with the given cues.
+    Returns 'appended' when the file was updated in place or 'rewritten' when
+    it had to be stream-copied. The file's access and modification times are
+    preserved, since the start time may be estimated from the latter.
+    """
+    path = Path(path)
+    new_chunks = build_cue_chunks(cues)
+    stat = path.stat()
+
+    with open(path, 'r+b') as f:
+        chunks = read_chunks(f)
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+
+        # Old markers only at the tail can be cut off in place
+        tail = len(chunks)
+        while tail > 0 and is_marker_chunk(chunks[tail - 1]):
+            tail -= 1
+        in_place = not any(is_marker_chunk(chunk) for chunk in chunks[:tail])
+
+        if in_place:
+            if tail < len(chunks):
+                end = chunks[tail][1]
+            elif chunks:
+                last = chunks[-1]
+                end = last[1] + 8 + last[2] + (last[2] & 1)
+            else:
+                end = 12
+            if end > file_size + 1:
+                raise WavFormatError("File is truncated (last chunk extends past the end of the file)")
+            if end - 8 + len(new_chunks) > MAX_RIFF_SIZE:
+                raise WavFormatError("File would exceed the 4 GiB RIFF size limit")
+
+            f.truncate(min(end, file_size))
+            f.seek(0, os.SEEK_END)
+            # Pad a final odd-sized chunk that is missing its pad byte
+            if f.tell() < end:
+                f.write(b'\x00' * (end - f.tell()))
+            f.write(new_chunks)
+            f.seek(4)
+            f.write(struct.pack('<I', end - 8 + len(new_chunks)))
+            f.flush()
+            os.fsync(f.fileno())
+            mode = 'appended'
+
+    if not in_place:
+        rewrite_without_markers(path, chunks, new_chunks)
+        mode = 'rewritten'
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    return mode
+
+
+def rewrite_without_markers(path, chunks, new_chunks):
+    """Stream-copy a WAV file, dropping old marker chunks and appending new ones."""
+    # The source is closed before the copy is renamed over it
+    with write_atomic(path, 'wb') as dst, open(path, 'rb') as src:
+        dst.write(b'RIFF\x00\x00\x00\x00WAVE')
+        for chunk in chunks:
+            if is_marker_chunk(chunk):
+                continue
+            _, offset, size, _ = chunk
+            src.seek(offset)
+            remaining = 8 + size
+            while remaining:
+                block = src.read(min(COPY_BUFFER_SIZE, remaining))
+                if not block:
+                    raise WavFormatError(f"Truncated chunk at offset {offset}")
+                dst.write(block)
+                remaining -= len(block)
+            if size & 1:
+                dst.write(b'\x00')
+        dst.write(new_chunks)
+        riff_size = dst.tell() - 8
+        if riff_size > MAX_RIFF_SIZE:
+            raise WavFormatError("File would exceed the 4 GiB RIFF size limit")
+        dst.seek(4)
+        dst.write(struct.pack('<I', riff_size))
+
+
+def event_label(event):
+    """Label shown for an event's marker."""
+    label = f"Event {event['timestamp_id']}"
+    if event['notes']:
+        label += f": {event['notes']}"
+    return label
+
+
+def cues_for_audio(events, audio_start, sample_rate, frame_count, offset=0.0):
+    """
+    Convert events to (sample_offset, label) cues for one audio file.
+    Returns the cues and the number of events outside the audio.
+    """
+    start_seconds = audio_start.timestamp()
+    cues = []
+    skipped = 0
+    for event in events:
+        sample = round((event['time'] + offset - start_seconds) * sample_rate)
+        if 0 <= sample < frame_count:
+            cues.append((sample, event_label(event)))
+        else:
+            skipped += 1
+    return cues, skipped
+
+
+def add_session_cues(recording, wav_path, audio_start=None, offset=0.0):
+    """Write a session recording's events as cue markers into one WAV file."""
+    wav_path = Path(wav_path)
+    with open(wav_path, 'rb') as f:
+        chunks = read_chunks(f)
+        sample_rate, _, frame_count = read_format(f, chunks)
+        if audio_start is None:
+            audio_start = read_bext_start(f, chunks, sample_rate)
+
+    if audio_start is None:
+        modified = datetime.datetime.fromtimestamp(wav_path.stat().st_mtime)
+        audio_start = modified - datetime.timedelta(seconds=frame_count / sample_rate)
+        logger.warning(f"{wav_path.name}: no start time given or embedded; "
+                       f"assuming recording ended at its modification time ({audio_start.isoformat()} start)")
+
+    cues, skipped = cues_for_audio(recording['events'], audio_start, sample_rate, frame_count, offset)
+    if skipped:
+        logger.warning(f"{wav_path.name}: {skipped} event(s) fall outside the audio and were skipped")
+
+    mode = write_cues(wav_path, cues)
+    logger.info(f"{wav_path.name}: wrote {len(cues)} cue markers ({mode})")
+    return len(cues)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed session recording events as cue markers in WAV files.")
+    parser.add_argument("recording", type=Path, help="session_recording_*.csv file")
+    parser.add_argument("audio", nargs="+", type=Path, help="One or two WAV files for the session")
+    parser.add_argument("--audio-start", type=datetime.datetime.fromisoformat,
+                        help="Local time the audio recordings started (ISO format)")
+    parser.add_argument("--offset", type=float, default=0.0,
+                        help="Seconds to add to every event time before placing markers")
+    args = parser.parse_args()
+
+    if len(args.audio) > 2:
+        parser.error("at most two audio files (one per stream) are supported")
+
+    try:
+        recording = read_session_recording(args.recording)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Could not read recording {args.recording}: {e}", exc_info=True)
+        print(f"\nError reading recording: {e}")
+        sys.exit(1)
+
+    failed = False
+    for wav_path in args.audio:
+        try:
+            add_session_cues(recording, wav_path, args.audio_start, args.offset)
+        except (OSError, ValueError, struct.error) as e:
+            logger.error(f"Failed to write cues to {wav_path}: {e}", exc_info=True)
+            print(f"\nError writing cues to {wav_path}: {e}")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()